@@ -0,0 +1,48 @@
+// Service worker for the tools pages.
+//
+// Keeps a copy of the tools list and the tool pages so repeat visits start
+// without waiting on the network and work offline. Cached pages are served
+// straight away and refreshed in the background, so an update shows on the
+// visit after it is deployed. Only the pages are handled: board corpus and
+// opening book files are fetched in pieces with Range requests and go to
+// the network as before.
+const CACHE_NAME = 'tools-shell-v1';
+const SHELL = ['./', 'index.html', 'catan-practice.html']
+    .map(path => new URL(path, self.registration.scope).href);
+
+self.addEventListener('install', (event) => {
+    event.waitUntil(
+        caches.open(CACHE_NAME)
+            .then(cache => cache.addAll(SHELL))
+            .then(() => self.skipWaiting())
+    );
+});
+
+self.addEventListener('activate', (event) => {
+    event.waitUntil(
+        caches.keys().then(names => Promise.all(
+            names.filter(name => name !== CACHE_NAME).map(name => caches.delete(name))
+        ))
+    );
+});
+
+self.addEventListener('fetch', (event) => {
+    const { request } = event;
+    const url = new URL(request.url);
+    url.search = '';
+    url.hash = '';
+    if (request.method !== 'GET' || !SHELL.includes(url.href)) return;
+
+    // Pages are cached without their query (?seed=, ?map=, ...), which the
+    // page reads itself
+    event.respondWith(caches.open(CACHE_NAME).then(async cache => {
+        const cached = await cache.match(url.href);
+        const fresh = fetch(request).then(response => {
+            if (response.ok) cache.put(url.href, response.clone());
+            return response;
+        });
+        if (!cached) return fresh;
+        event.waitUntil(fresh.catch(() => {}));
+        return cached;
+    }));
+});
@@ -1,56 +1,174 @@
-from http.client import HTTPConnection
+import functools
 import pathlib
+import threading
+from http.server import ThreadingHTTPServer
+
 import pytest
-from subprocess import Popen, PIPE
-import time
-import socket
+
+from tools.serve import RangeRequestHandler
 
 test_dir = pathlib.Path(__file__).parent.absolute()
 root = test_dir.parent.absolute()
 
+PRACTICE_PAGE = "/catan-practice.html"
+
+
+class QuietHandler(RangeRequestHandler):
+    """Static file handler (with Range requests) that doesn't log every request."""
 
-def is_port_in_use(port):
-    """Check if a port is already in use."""
-    with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-        return s.connect_ex(('127.0.0.1', port)) == 0
+    def log_message(self, format, *args):
+        pass
 
 
-@pytest.fixture(scope="module")
+@pytest.fixture(scope="session")
 def static_server():
-    """Start a local HTTP server for testing."""
-    # Kill any existing process on port 8123
-    if is_port_in_use(8123):
-        import os
-        os.system("fuser -k 8123/tcp 2>/dev/null")
-        time.sleep(1)
-
-    process = Popen(
-        ["python3", "-m", "http.server", "8123", "--directory", str(root)],
-        stdout=PIPE,
-        stderr=PIPE,
+    """Serve the repository on an ephemeral port for the whole session.
+
+    Yields the server's base URL, which is also Playwright's ``base_url``, so
+    tests navigate with paths like ``page.goto("/index.html")``. Under
+    pytest-xdist every worker is its own session with its own port.
+    """
+    handler = functools.partial(QuietHandler, directory=str(root))
+    server = ThreadingHTTPServer(("127.0.0.1", 0), handler)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+    yield f"http://127.0.0.1:{server.server_port}"
+    server.shutdown()
+    server.server_close()
+    thread.join()
+
+
+@pytest.fixture(scope="session")
+def base_url(static_server):
+    """Base URL for Playwright contexts: the session's static server."""
+    return static_server
+
+
+@pytest.fixture(scope="session")
+def browser_context_args(browser_context_args):
+    """Playwright context options, with sw.js kept out of the way.
+
+    Pages served by the service worker come from its cache, so requests
+    would bypass ``page.route()``. Tests of the service worker open their
+    own context with ``service_workers="allow"``.
+    """
+    return {**browser_context_args, "service_workers": "block"}
+
+
+@pytest.fixture(scope="session")
+def practice_page_pool(browser, browser_context_args):
+    """Idle catan-practice.html pages, kept loaded between tests."""
+    context = browser.new_context(**browser_context_args)
+    pool = []
+    yield pool, context
+    context.close()
+
+
+@pytest.fixture
+def practice_page(practice_page_pool):
+    """A loaded catan-practice.html page showing a fresh random board.
+
+    Pages are reused: after a test the page goes back to the pool, and the
+    next test gets it back through the page's ``resetPractice()`` hook
+    instead of a reload. Call ``resetPractice(seed)`` for a seeded board.
+    Tests that need URL parameters or a different viewport should use
+    ``page``; a pooled page that navigates away or is resized is dropped.
+    """
+    pool, context = practice_page_pool
+    if pool:
+        page = pool.pop()
+        page.evaluate("resetPractice()")
+    else:
+        page = context.new_page()
+        page.goto(PRACTICE_PAGE)
+    viewport = page.viewport_size
+    yield page
+    if not page.is_closed() and page.url.endswith(PRACTICE_PAGE) and page.viewport_size == viewport:
+        pool.append(page)
+    elif not page.is_closed():
+        page.close()
+
+
+# Position of the n-th shown "vertex" or "edge" hint, relative to #board (a
+# vertex hint's centre or the middle of a road hint; vertices by index)
+HINT_POSITION = """([kind, n]) => {
+    const board = document.getElementById('board');
+    const shown = kind === 'vertex'
+        ? Array.from(boardView.vertexHintShown.keys()).filter(v => boardView.vertexHintShown[v])
+        : boardView.edgeHintsShown;
+    const [v1, v2] = kind === 'vertex'
+        ? [shown[n], shown[n]]
+        : [TOPOLOGY.edgeVertices[shown[n] * 2], TOPOLOGY.edgeVertices[shown[n] * 2 + 1]];
+    const point = new DOMPoint(
+        (TOPOLOGY.vertexX[v1] + TOPOLOGY.vertexX[v2]) / 2,
+        (TOPOLOGY.vertexY[v1] + TOPOLOGY.vertexY[v2]) / 2
+    ).matrixTransform(board.getScreenCTM());
+    const rect = board.getBoundingClientRect();
+    return { x: point.x - rect.left, y: point.y - rect.top };
+}"""
+
+
+@pytest.fixture
+def click_hint():
+    """Click a shown placement hint: ``click_hint(page, "vertex")`` or ``(page, "edge", n)``.
+
+    The click lands on ``#board`` at the hint's position, which the page
+    hit-tests as it does a user's click (hints themselves take no pointer
+    events).
+    """
+    def click(page, kind, n=0):
+        page.locator("#board").click(position=page.evaluate(HINT_POSITION, [kind, n]))
+
+    return click
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup("benchmark", "page benchmarks (test_catan_benchmarks.py)")
+    group.addoption(
+        "--benchmark",
+        action="store_true",
+        help="run the page benchmarks, which are skipped by default",
+    )
+    group.addoption(
+        "--benchmark-json",
+        default=str(root / ".benchmarks" / "latest.json"),
+        help="where to write benchmark results (default: .benchmarks/latest.json)",
     )
+    group.addoption(
+        "--benchmark-baseline",
+        default=None,
+        help="results file from an earlier run to compare against",
+    )
+    group.addoption(
+        "--benchmark-threshold",
+        type=float,
+        default=1.25,
+        help="fail when a median exceeds the baseline's by this factor (default: 1.25)",
+    )
+
+    group = parser.getgroup("fuzz", "page/engine differential fuzzing (test_catan_fuzz.py)")
+    group.addoption(
+        "--fuzz-cases",
+        type=int,
+        default=2000,
+        help="random cases to run through the page and the engine (default: 2000)",
+    )
+    group.addoption(
+        "--fuzz-seed",
+        type=int,
+        default=None,
+        help="seed for the fuzz cases (default: random, reported on failure)",
+    )
+
+
+def pytest_configure(config):
+    config.addinivalue_line("markers", "benchmark: page timing benchmark, run with --benchmark")
+
 
-    # Wait for server to be ready
-    retries = 10
-    while retries > 0:
-        try:
-            conn = HTTPConnection("127.0.0.1", 8123, timeout=5)
-            conn.request("HEAD", "/")
-            response = conn.getresponse()
-            if response is not None:
-                break
-        except (ConnectionRefusedError, OSError):
-            time.sleep(0.5)
-            retries -= 1
-        finally:
-            conn.close()
-
-    if retries <= 0:
-        process.terminate()
-        process.wait()
-        raise RuntimeError("Failed to start http server")
-
-    yield process
-
-    process.terminate()
-    process.wait()
+def pytest_collection_modifyitems(config, items):
+    if config.getoption("--benchmark"):
+        return
+    skip = pytest.mark.skip(reason="benchmarks only run with --benchmark")
+    for item in items:
+        if "benchmark" in item.keywords:
+            item.add_marker(skip)
@@ -0,0 +1,52 @@
+import random
+
+import numpy as np
+
+from tools.catan import generate_board, is_valid_board
+from tools.catan.batch import BoardBatch, generate_boards, validate_boards, vertex_pips
+
+
+def test_generate_boards_shapes_and_validity():
+    """Test that batch boards have the right shapes, contents and rules."""
+    batch = generate_boards(2000, seed=1)
+    assert batch.resources.shape == (2000, 19)
+    assert batch.numbers.shape == (2000, 19)
+    assert batch.ports.shape == (2000, 9)
+    assert validate_boards(batch.numbers).all()
+    assert ((batch.numbers == 0) == (batch.resources == 5)).all()
+    assert (np.sort(batch.numbers, axis=1)[:, 1:] == sorted(
+        [5, 2, 6, 3, 8, 10, 9, 12, 11, 4, 8, 10, 9, 4, 5, 6, 3, 11])).all()
+    assert (np.bincount(batch.resources.ravel(), minlength=6) == [8000, 8000, 8000, 6000, 6000, 2000]).all()
+    assert ((batch.ports == 0).sum(axis=1) == 4).all()
+    for k in range(0, 2000, 97):
+        assert is_valid_board(batch.board(k).numbers)
+
+
+def test_generate_boards_deterministic():
+    """Test that the same seed gives the same boards."""
+    a = generate_boards(500, seed=42)
+    b = generate_boards(500, seed=42)
+    c = generate_boards(500, seed=43)
+    assert (a.numbers == b.numbers).all() and (a.resources == b.resources).all()
+    assert not (a.numbers == c.numbers).all()
+
+
+def test_validate_boards_matches_is_valid_board():
+    """Test that the vectorized rules agree with the per-board rules."""
+    rng = random.Random(3)
+    boards = [generate_board(rng.random) for _ in range(50)]
+    numbers = BoardBatch.from_boards(boards).numbers
+
+    # Shuffle tokens within each board to get a mix of valid and invalid layouts
+    candidates = np.array([rng.sample(list(row), len(row)) for row in numbers for _ in range(20)])
+    expected = [is_valid_board([int(n) or None for n in row]) for row in candidates]
+    assert validate_boards(candidates).tolist() == expected
+    assert 0 < sum(expected) < len(expected)
+
+
+def test_vertex_pips():
+    """Test that vertex pips sum the touching hexes' dots."""
+    board = generate_board(random.Random(4).random)
+    pips = vertex_pips(BoardBatch.from_boards([board]).numbers)[0]
+    assert pips.shape == (54,)
+    assert pips.max() < 13
@@ -0,0 +1,159 @@
+"""Timing benchmarks for the hot functions in catan-practice.html.
+
+Opt-in: ``pytest tests/test_catan_benchmarks.py --benchmark``. Each benchmark
+times a page function with ``page.evaluate`` and records per-call times in
+milliseconds (min, percentiles, max, mean) in ``--benchmark-json``. Given
+``--benchmark-baseline`` (a results file from an earlier run, e.g. a copy of
+``.benchmarks/latest.json`` from the main branch, on the same machine), a
+benchmark fails when its median is more than ``--benchmark-threshold`` times
+the baseline's.
+
+Browsers coarsen ``performance.now()``, so fast functions are timed in
+batches of ``inner`` calls and each sample is the batch time / ``inner``.
+"""
+import json
+import pathlib
+
+import pytest
+from playwright.sync_api import Page
+
+pytestmark = pytest.mark.benchmark
+
+URL = "/catan-practice.html?seed=42"
+WARMUP_SAMPLES = 5
+PERCENTILES = (50, 90, 99)
+
+# Moves for a finished draft: every player's settlement and road
+PLAY_DRAFT = """
+    while (gameState.phase !== 'done') {
+        if (gameState.phase === 'settlement') placeSettlement(getValidSettlementVertices()[0].key);
+        else placeRoad(getValidRoadEdges()[0].key);
+    }
+"""
+
+
+def summarize(values):
+    """Min, nearest-rank percentiles, max and mean of ``values``."""
+    ordered = sorted(values)
+    summary = {"min": ordered[0]}
+    for p in PERCENTILES:
+        summary[f"p{p}"] = ordered[max(0, -(-p * len(ordered) // 100) - 1)]
+    summary["max"] = ordered[-1]
+    summary["mean"] = sum(ordered) / len(ordered)
+    return summary
+
+
+def time_in_page(page, setup, body, samples, inner):
+    """Per-call times (ms) of ``body``: ``samples`` batches of ``inner`` calls after ``setup``."""
+    return page.evaluate(
+        f"""([samples, inner, warmup]) => {{
+            {setup}
+            const times = [];
+            for (let s = -warmup; s < samples; s++) {{
+                const start = performance.now();
+                for (let i = 0; i < inner; i++) {{
+                    {body}
+                }}
+                if (s >= 0) times.push((performance.now() - start) / inner);
+            }}
+            return times;
+        }}""",
+        [samples, inner, WARMUP_SAMPLES],
+    )
+
+
+@pytest.fixture(scope="module")
+def benchmark_results(pytestconfig):
+    """Collect results, check them against the baseline and write them out."""
+    baseline_path = pytestconfig.getoption("--benchmark-baseline")
+    baseline = {}
+    if baseline_path:
+        baseline = json.loads(pathlib.Path(baseline_path).read_text())["benchmarks"]
+    threshold = pytestconfig.getoption("--benchmark-threshold")
+    results = {"benchmarks": {}, "generate_board_attempts": None}
+
+    def record(name, times, samples, inner):
+        result = {"unit": "ms", "samples": samples, "inner": inner, **summarize(times)}
+        results["benchmarks"][name] = result
+        if name in baseline:
+            limit = baseline[name]["p50"] * threshold
+            assert result["p50"] <= limit, (
+                f"{name}: median {result['p50']:.4f} ms, baseline {baseline[name]['p50']:.4f} ms "
+                f"(limit {limit:.4f} ms at x{threshold})"
+            )
+
+    record.results = results
+    yield record
+
+    path = pathlib.Path(pytestconfig.getoption("--benchmark-json"))
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(results, indent=2) + "\n")
+
+
+def run_benchmark(page, benchmark_results, name, body, setup="", samples=50, inner=1):
+    page.goto(URL)
+    times = time_in_page(page, setup, body, samples, inner)
+    benchmark_results(name, times, samples, inner)
+
+
+def test_generate_board(page: Page, static_server, benchmark_results):
+    """Benchmark generateBoard over a fixed run of seeds and record its attempt distribution."""
+    body = "generateBoard(seed++);"
+    run_benchmark(page, benchmark_results, "generate_board", body, "let seed = 1;", samples=200)
+    attempts = page.evaluate("""() => {
+        const attempts = [];
+        for (let seed = 1; seed <= 1000; seed++) {
+            generateBoard(seed);
+            attempts.push(lastGeneration.attempts);
+        }
+        return attempts;
+    }""")
+    benchmark_results.results["generate_board_attempts"] = {
+        "seeds": len(attempts),
+        "attempts": summarize(attempts),
+    }
+
+
+def test_is_valid_board(page: Page, static_server, benchmark_results):
+    """Benchmark isValidBoard on a generated board."""
+    setup = "const hexes = gameState.hexes;"
+    run_benchmark(page, benchmark_results, "is_valid_board", "isValidBoard(hexes);", setup, inner=1000)
+
+
+def test_build_vertices_and_edges(page: Page, static_server, benchmark_results):
+    """Benchmark buildVerticesAndEdges resetting the board's vertices and edges."""
+    run_benchmark(page, benchmark_results, "build_vertices_and_edges", "buildVerticesAndEdges();", inner=100)
+
+
+def test_valid_settlement_vertices(page: Page, static_server, benchmark_results):
+    """Benchmark getValidSettlementVertices with four settlements down."""
+    setup = """for (let k = 0; k < 4; k++) {
+        placeSettlement(getValidSettlementVertices()[0].key);
+        placeRoad(getValidRoadEdges()[0].key);
+    }"""
+    body = "getValidSettlementVertices();"
+    run_benchmark(page, benchmark_results, "valid_settlement_vertices", body, setup, inner=1000)
+
+
+def test_valid_road_edges(page: Page, static_server, benchmark_results):
+    """Benchmark getValidRoadEdges in a road phase."""
+    setup = "placeSettlement(getValidSettlementVertices()[0].key);"
+    run_benchmark(page, benchmark_results, "valid_road_edges", "getValidRoadEdges();", setup, inner=1000)
+
+
+def test_render_full(page: Page, static_server, benchmark_results):
+    """Benchmark render redrawing the whole board."""
+    body = "boardView.boardId = -1; render();"
+    run_benchmark(page, benchmark_results, "render_full", body, PLAY_DRAFT, inner=10)
+
+
+def test_place_and_undo(page: Page, static_server, benchmark_results):
+    """Benchmark a settlement placement and its undo, each patching the board and the UI."""
+    setup = "const key = getValidSettlementVertices()[0].key;"
+    run_benchmark(page, benchmark_results, "place_and_undo", "placeSettlement(key); undo();", setup, inner=10)
+
+
+def test_save_load_round_trip(page: Page, static_server, benchmark_results):
+    """Benchmark saveBoard/loadBoard round trips of a finished draft."""
+    body = "loadBoard(saveBoard());"
+    run_benchmark(page, benchmark_results, "save_load_round_trip", body, PLAY_DRAFT, inner=10)
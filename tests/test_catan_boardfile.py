@@ -0,0 +1,76 @@
+import numpy as np
+import pytest
+from playwright.sync_api import Page
+
+from tools.catan.batch import generate_boards
+from tools.catan.boardfile import (
+    RECORD_SIZE,
+    BoardFile,
+    decode_records,
+    encode_records,
+    write_board_file,
+)
+from tools.catan.corpus import generate_corpus, write_corpus
+
+
+def test_records_round_trip():
+    """Test that encoding and decoding records preserves every board."""
+    batch = generate_boards(2000, seed=3)
+    records = encode_records(batch)
+    assert records.shape == (2000, RECORD_SIZE)
+    decoded = decode_records(records)
+    for field in ("resources", "numbers", "ports"):
+        assert np.array_equal(getattr(decoded, field), getattr(batch, field))
+
+
+def test_write_corpus_matches_generate_corpus(tmp_path):
+    """Test that a streamed corpus file holds the generated boards in order."""
+    path = tmp_path / "boards.bin"
+    write_corpus(path, 2500, seed=9, workers=1, task_size=1000)
+    boards = BoardFile(path)
+    expected = generate_corpus(2500, seed=9, workers=1, task_size=1000)
+    assert len(boards) == 2500
+    assert boards.seed == 9
+    assert boards.board(1234) == expected.board(1234)
+    assert np.array_equal(boards.batch(1000, 2000).numbers, expected.numbers[1000:2000])
+
+
+def test_indexed_corpus_lookup(tmp_path):
+    """Test that board numbers are looked up through the index."""
+    batch = generate_boards(50, seed=4)
+    path = tmp_path / "boards.bin"
+    write_board_file(path, batch, ids=np.arange(50) * 10 + 100)
+    boards = BoardFile(path)
+    assert boards.find(230) == 13
+    assert boards.board_number(13) == 230
+    assert boards.board(boards.find(230)) == batch.board(13)
+    with pytest.raises(KeyError):
+        boards.find(231)
+
+
+def test_rejects_non_corpus_file(tmp_path):
+    """Test that other files are rejected."""
+    path = tmp_path / "boards.bin"
+    path.write_bytes(b"not a corpus file at all, just some bytes")
+    with pytest.raises(ValueError):
+        BoardFile(path)
+
+
+def test_page_loads_corpus_board(page: Page, static_server):
+    """Test that ?board=N shows board N of the shipped corpus."""
+    expected = BoardFile("catan-boards.bin").board(4242)
+    page.goto("/catan-practice.html?board=4242")
+    page.wait_for_function("gameState.boardNumber === 4242")
+    result = page.evaluate("""
+        () => ({
+            resources: gameState.hexes.map(h => h.resource),
+            numbers: gameState.hexes.map(h => h.number),
+            ports: gameState.ports.map(p => p.type)
+        })
+    """)
+    assert tuple(result["resources"]) == expected.resources
+    assert tuple(result["numbers"]) == expected.numbers
+    assert tuple(result["ports"]) == expected.port_types
+    assert page.locator("#boardNumber").inner_text() == "Board #4242"
+    # The test server answers Range requests, so the page never holds the whole file
+    assert page.evaluate("openCorpus().then(corpus => corpus.bytes)") is None
@@ -0,0 +1,153 @@
+import random
+
+import pytest
+from playwright.sync_api import Page
+
+from tools.catan import Game, Mulberry32, generate_board, load_board, save_board
+from tools.catan.book import BookFile, OpeningBook, best_settlement, board_features, export_book
+from tools.catan.evaluate import evaluate_vertices
+from tools.catan.zobrist import board_key, format_key, position_key
+
+
+def draft_positions(seed, boards=5):
+    """Every settlement-phase position of a random draft on each of ``boards`` boards."""
+    rng = random.Random(seed)
+    games = []
+    for _ in range(boards):
+        game = Game(generate_board(rng.random))
+        while game.phase != "done":
+            if game.phase == "settlement":
+                games.append(load_board(save_board(game)))
+            game.play(rng.choice(game.legal_moves()))
+    return games
+
+
+def test_position_keys_distinguish_turns_and_placements():
+    """Test that keys change with each move and come back on undo."""
+    rng = random.Random(1)
+    game = Game(generate_board(rng.random))
+    keys = [position_key(game)]
+    while game.phase != "done":
+        game.play(rng.choice(game.legal_moves()))
+        keys.append(position_key(game))
+    assert len(set(keys)) == len(keys)
+    for key in reversed(keys[:-1]):
+        game.undo()
+        assert position_key(game) == key
+
+
+def test_book_lookup(tmp_path):
+    """Test that stored positions are found by key with their greedy best move."""
+    games = draft_positions(2)
+    with OpeningBook(tmp_path / "book.db") as book:
+        assert book.add_positions(games) == len(games)
+        for game in games:
+            move = book.lookup(position_key(game))
+            vertex, score = best_settlement(game)
+            assert move.player == game.current_player
+            assert (move.vertex, move.score) == (vertex, pytest.approx(score))
+            assert move.vertex in game.legal_settlements()
+            assert book.position_code(position_key(game)) == save_board(game)
+        assert book.lookup(position_key(games[0]) ^ 1) is None
+
+    with OpeningBook(tmp_path / "book.db") as book:
+        assert len(book) == len(games)
+
+
+def test_best_settlement_is_top_legal_score():
+    """Test that the best move scores at least as well as every legal settlement."""
+    for game in draft_positions(3, boards=2):
+        scores = evaluate_vertices(game.board)
+        vertex, score = best_settlement(game)
+        assert score == max(scores[v].total for v in game.legal_settlements())
+
+
+def test_find_boards_by_features():
+    """Test that feature queries return exactly the matching boards."""
+    rng = random.Random(4)
+    boards = [generate_board(rng.random) for _ in range(200)]
+    book = OpeningBook(":memory:")
+    book.add_positions(Game(board) for board in boards)
+
+    expected = sorted(
+        board_key(b) for b in boards
+        if board_features(b)[2] == "ore" and board_features(b)[1] >= 11
+    )
+    found = book.find_boards(top_port="ore", min_top_pips=11)
+    assert [b.key for b in found] == expected
+    assert all(b.top_port == "ore" and b.top_pips >= 11 for b in found)
+    assert len(book.find_boards()) == len({board_key(b) for b in boards})
+    assert len(book.find_boards(limit=5)) == 5
+
+
+def test_exported_key_file_matches_book(tmp_path):
+    """Test that the key file answers the same lookups as the database."""
+    games = draft_positions(5)
+    book = OpeningBook(":memory:")
+    book.add_positions(games)
+    export_book(book, tmp_path / "book.bin")
+    book_file = BookFile(tmp_path / "book.bin")
+    assert len(book_file) == len(book)
+    for game in games:
+        key = position_key(game)
+        stored, read = book.lookup(key), book_file.lookup(key)
+        assert (read.player, read.vertex) == (stored.player, stored.vertex)
+        assert read.score == pytest.approx(stored.score, rel=1e-6)
+    assert book_file.lookup(position_key(games[0]) ^ 1) is None
+
+
+def test_rejects_non_book_file(tmp_path):
+    """Test that BookFile refuses files without the book header."""
+    path = tmp_path / "book.bin"
+    path.write_bytes(b"CATANBRD" + bytes(24))
+    with pytest.raises(ValueError):
+        BookFile(path)
+
+
+def test_page_position_keys_match_engine(practice_page: Page, click_hint):
+    """Test that the page's position keys equal the engine's for the same positions."""
+    practice_page.evaluate("resetPractice(42)")
+    for _ in range(3):
+        click_hint(practice_page, "vertex")
+        click_hint(practice_page, "edge")
+        result = practice_page.evaluate("() => ({ saved: saveBoard(), key: positionKey() })")
+        assert format_key(position_key(load_board(result["saved"]))) == result["key"]
+    assert practice_page.evaluate("boardKey()") == format_key(board_key(generate_board(Mulberry32(42))))
+
+
+def test_page_shows_book_move(page: Page, static_server, tmp_path):
+    """Test that ?book=URL shows the stored move for a position in the book."""
+    game = Game(generate_board(Mulberry32(42)))
+    book = OpeningBook(":memory:")
+    book.add_positions([game])
+    export_book(book, tmp_path / "book.bin")
+    page.route("**/test-book.bin", lambda route: route.fulfill(body=(tmp_path / "book.bin").read_bytes()))
+
+    page.goto("/catan-practice.html?seed=42&book=test-book.bin")
+    page.wait_for_function("solver.suggestion !== null")
+    move = book.lookup(position_key(game))
+    assert page.evaluate("solver.suggestion.move") == move.vertex
+    assert page.locator("#suggestionInfo").inner_text() == (
+        f"Best for Player {move.player}: +{move.score:.1f} (book)"
+    )
+
+
+def test_page_rejects_wrong_record_size_and_retries(page: Page, static_server, tmp_path):
+    """Test that the page refuses a book with another record size, then opens a good one on the next lookup."""
+    game = Game(generate_board(Mulberry32(42)))
+    book = OpeningBook(":memory:")
+    book.add_positions([game])
+    export_book(book, tmp_path / "book.bin")
+    good = (tmp_path / "book.bin").read_bytes()
+    served = {"body": good[:10] + (24).to_bytes(2, "little") + good[12:]}
+    page.route("**/test-book.bin", lambda route: route.fulfill(body=served["body"]))
+
+    page.goto("/catan-practice.html?seed=42&book=test-book.bin")
+    error = page.evaluate("lookupBook(positionKey()).then(() => null, error => error.message)")
+    assert error == "test-book.bin is not an opening book"
+    assert page.evaluate("book.opened") is None
+
+    served["body"] = good
+    assert page.evaluate("lookupBook(positionKey()).then(record => record.vertex)") == (
+        book.lookup(position_key(game)).vertex
+    )
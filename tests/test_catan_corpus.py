@@ -0,0 +1,78 @@
+import numpy as np
+
+from tools.catan import generate_board
+from tools.catan.batch import validate_boards
+from tools.catan.corpus import MAX_TASKS_IN_FLIGHT, generate_corpus, iter_corpus
+from tools.catan.rng import Mulberry32
+
+
+def test_mulberry32_matches_page():
+    """Test the PRNG against outputs of the page's mulberry32()."""
+    rng = Mulberry32(12345)
+    assert [rng.next_uint32() for _ in range(3)] == [4207900869, 1317490944, 2079646450]
+    rng = Mulberry32(4294967295)
+    assert [rng.next_uint32() for _ in range(2)] == [3850105811, 813802916]
+    assert 0 <= Mulberry32(7)() < 1
+
+
+def test_seeded_board_is_reproducible():
+    """Test that a seed always gives the same board."""
+    assert generate_board(Mulberry32(99)) == generate_board(Mulberry32(99))
+    assert generate_board(Mulberry32(99)) != generate_board(Mulberry32(100))
+
+
+def test_corpus_identical_across_worker_counts():
+    """Test that corpus output depends only on the seed."""
+    one = generate_corpus(5000, seed=7, workers=1, task_size=1000)
+    two = generate_corpus(5000, seed=7, workers=2, task_size=1000)
+    for a, b in ((one.resources, two.resources), (one.numbers, two.numbers), (one.ports, two.ports)):
+        assert a.tobytes() == b.tobytes()
+    assert validate_boards(one.numbers).all()
+
+    other = generate_corpus(5000, seed=8, workers=1, task_size=1000)
+    assert other.numbers.tobytes() != one.numbers.tobytes()
+
+
+def test_iter_corpus_chunks():
+    """Test that the corpus streams in task-sized chunks."""
+    sizes = [len(chunk) for chunk in iter_corpus(2500, seed=1, workers=1, task_size=1000)]
+    assert sizes == [1000, 1000, 500]
+    assert len(generate_corpus(0, seed=1)) == 0
+    assert np.array_equal(
+        next(iter_corpus(10, seed=3, workers=1)).numbers,
+        generate_corpus(10, seed=3, workers=1).numbers,
+    )
+
+
+def test_iter_corpus_bounds_tasks_in_flight(monkeypatch):
+    """Test that the corpus submits tasks only as its chunks are consumed."""
+    submitted = []
+
+    class Result:
+        def __init__(self, value):
+            self.value = value
+
+        def get(self):
+            return self.value
+
+    class InlinePool:
+        def __init__(self, workers):
+            pass
+
+        def __enter__(self):
+            return self
+
+        def __exit__(self, *exc):
+            pass
+
+        def apply_async(self, fn, args):
+            submitted.append(args[0])
+            return Result(fn(*args))
+
+    monkeypatch.setattr("tools.catan.corpus.multiprocessing.Pool", InlinePool)
+    chunks = iter_corpus(20 * 100, seed=1, workers=2, task_size=100)
+    for taken in range(1, 6):
+        next(chunks)
+        assert len(submitted) <= taken + MAX_TASKS_IN_FLIGHT * 2
+    assert len(list(chunks)) == 15
+    assert [task for _, task, _ in submitted] == list(range(20))
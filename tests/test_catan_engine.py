@@ -0,0 +1,332 @@
+import random
+
+import pytest
+from playwright.sync_api import Page
+
+from tools.catan import (
+    EXTENSION_MAP,
+    PLACEMENT_ORDER,
+    TOPOLOGY,
+    NUMBER_PROBABILITY,
+    Game,
+    build_topology,
+    generate_board,
+    is_valid_board,
+    load_board,
+    save_board,
+    save_board_legacy,
+)
+from tools.catan.generate import assign_numbers
+from tools.catan.rng import Mulberry32
+
+
+def play_random_draft(game, rng, moves=None):
+    """Play random legal moves until the draft is done (or `moves` run out)."""
+    played = 0
+    while game.phase != "done" and (moves is None or played < moves):
+        game.play(rng.choice(game.legal_moves()))
+        played += 1
+
+
+def test_topology_counts():
+    """Test that the base board has 19 hexes, 54 vertices and 72 edges."""
+    assert (TOPOLOGY.hex_count, TOPOLOGY.vertex_count, TOPOLOGY.edge_count) == (19, 54, 72)
+    assert all(len(n) in (2, 3) for n in TOPOLOGY.vertex_neighbors)
+
+
+def test_generated_boards_are_valid():
+    """Test that generated boards pass validation and use the full token set."""
+    rng = random.Random(1)
+    for _ in range(200):
+        board = generate_board(rng.random)
+        assert is_valid_board(board.numbers)
+        assert board.numbers[board.robber_hex] is None
+        assert sorted(n for n in board.numbers if n is not None) == sorted(
+            [5, 2, 6, 3, 8, 10, 9, 12, 11, 4, 8, 10, 9, 4, 5, 6, 3, 11]
+        )
+        assert sorted(board.port_types).count("3:1") == 4
+
+
+def broken_rules(numbers, hex_index, number):
+    """The board rules broken by dealing ``number`` onto ``hex_index`` of ``numbers``."""
+    adjacent = [numbers[h] for h in TOPOLOGY.hex_neighbors[hex_index]]
+    rules = set()
+    if number in (6, 8) and any(n in (6, 8) for n in adjacent):
+        rules.add("red")
+    if number in adjacent:
+        rules.add("same")
+    for v in TOPOLOGY.hex_vertices[hex_index]:
+        if NUMBER_PROBABILITY[number] + sum(
+            NUMBER_PROBABILITY[numbers[h]] for h in TOPOLOGY.vertex_hexes[v] if numbers[h] is not None
+        ) >= 13:
+            rules.add("pips")
+    return rules
+
+
+def scripted_rng(hexes):
+    """An rng for which the forward Fisher-Yates deal picks ``hexes`` in order."""
+    order = list(range(TOPOLOGY.hex_count))
+    values = []
+    for i, h in enumerate(hexes):
+        j = order.index(h, i)
+        values.append((j - i + 0.5) / (len(order) - i))
+        order[i], order[j] = order[j], order[i]
+    return iter(values).__next__
+
+
+def breaking_deal(rule):
+    """Hexes for the base map's deal order on which the last token breaks exactly ``rule``."""
+    deal = (6, 8, 8, 6, 5, 9, 9, 5, 10, 4, 10, 4, 3, 11, 3, 11, 2, 12)
+    rng = random.Random(rule)
+    while True:
+        numbers = [None] * TOPOLOGY.hex_count
+        hexes = rng.sample(range(TOPOLOGY.hex_count), len(deal))
+        for dealt, (h, number) in enumerate(zip(hexes, deal)):
+            rules = broken_rules(numbers, h, number)
+            if rules:
+                break
+            numbers[h] = number
+        if rules == {rule}:
+            return hexes[:dealt + 1]
+
+
+@pytest.mark.parametrize("rule", ["red", "same", "pips"])
+def test_deal_abandoned_at_first_broken_rule(rule):
+    """Test that an attempt stops at the first token that breaks each board rule."""
+    hexes = breaking_deal(rule)
+    script = scripted_rng(hexes)
+    draws = []
+    assert assign_numbers(lambda: draws.append(None) or script(), max_attempts=1) == (None, 1)
+    assert len(draws) == len(hexes)
+
+
+def test_invalid_board_rejected():
+    """Test that adjacent 6 and 8 fail validation."""
+    board = generate_board(random.Random(2).random)
+    numbers = list(board.numbers)
+    a = next(i for i, n in enumerate(numbers) if n is not None and any(
+        numbers[j] is not None for j in TOPOLOGY.hex_neighbors[i]))
+    b = next(j for j in TOPOLOGY.hex_neighbors[a] if numbers[j] is not None)
+    numbers[a], numbers[b] = 6, 8
+    assert not is_valid_board(numbers)
+
+
+def test_snake_draft_order():
+    """Test that players place in 1-2-3-4-4-3-2-1 order."""
+    game = Game(generate_board(random.Random(3).random))
+    players = []
+    while game.phase != "done":
+        assert game.phase == "settlement"
+        players.append(game.current_player)
+        game.place_settlement(game.legal_settlements()[0])
+        assert game.phase == "road"
+        game.place_road(game.legal_roads()[0])
+    assert players == list(PLACEMENT_ORDER)
+    assert sum(1 for p in game.settlements if p) == 8
+    assert sum(1 for p in game.roads if p) == 8
+
+
+def test_distance_rule_and_undo():
+    """Test that settlements block neighbours and undo releases them."""
+    game = Game(generate_board(random.Random(4).random), skip_roads=True)
+    v = game.legal_settlements()[0]
+    game.place_settlement(v)
+    legal = game.legal_settlements()
+    assert v not in legal
+    assert not set(TOPOLOGY.vertex_neighbors[v]) & set(legal)
+    assert game.current_player == 2
+
+    game.undo()
+    assert game.legal_settlements() == list(range(TOPOLOGY.vertex_count))
+
+
+def test_undo_restores_turn():
+    """Test that undo returns to the turn the action was made on, with or without roads."""
+    rng = random.Random(6)
+    for skip_roads in (False, True):
+        game = Game(generate_board(rng.random), skip_roads=skip_roads)
+        turns = []
+        while game.phase != "done":
+            turns.append((game.placement_index, game.current_player, game.phase, game.round))
+            game.play(rng.choice(game.legal_moves()))
+        while turns:
+            game.undo()
+            assert (game.placement_index, game.current_player, game.phase, game.round) == turns.pop()
+        assert not any(game.settlements) and not any(game.roads)
+
+
+def test_save_load_round_trip():
+    """Test that saving and loading preserves the position."""
+    rng = random.Random(5)
+    for moves in (0, 5, 16):
+        game = Game(generate_board(rng.random))
+        play_random_draft(game, rng, moves)
+        loaded = load_board(save_board(game))
+        assert loaded.board == game.board
+        assert loaded.settlements == game.settlements
+        assert loaded.roads == game.roads
+        assert (loaded.current_player, loaded.phase, loaded.placement_index) == (
+            game.current_player, game.phase, game.placement_index)
+        assert loaded.history == game.history
+        assert save_board(loaded) == save_board(game)
+
+
+def test_load_legacy_save():
+    """Test that old base64 JSON saves still load."""
+    rng = random.Random(6)
+    game = Game(generate_board(rng.random))
+    play_random_draft(game, rng, 11)
+    loaded = load_board(save_board_legacy(game))
+    assert loaded.board == game.board
+    assert loaded.settlements == game.settlements
+    assert loaded.roads == game.roads
+    assert (loaded.current_player, loaded.phase, loaded.placement_index) == (
+        game.current_player, game.phase, game.placement_index)
+    assert save_board_legacy(loaded) == save_board_legacy(game)
+
+
+def test_legacy_save_undoes_in_play_order():
+    """Test that undoing a loaded legacy save with roads steps back through the draft."""
+    rng = random.Random(7)
+    game = Game(generate_board(rng.random))
+    play_random_draft(game, rng, 11)
+    loaded = load_board(save_board_legacy(game))
+    while game.history:
+        game.undo()
+        loaded.undo()
+        assert (loaded.current_player, loaded.phase, loaded.placement_index) == (
+            game.current_player, game.phase, game.placement_index)
+    assert not loaded.history and not any(loaded.settlements) and not any(loaded.roads)
+
+
+def test_load_rejects_garbage():
+    """Test that malformed input raises ValueError."""
+    with pytest.raises(ValueError):
+        load_board("not a board")
+    with pytest.raises(ValueError):
+        load_board("B")
+
+
+def test_page_undoes_legacy_save_in_play_order(practice_page: Page):
+    """Test that the page steps back through a loaded legacy save's draft like the engine."""
+    rng = random.Random(7)
+    game = Game(generate_board(rng.random))
+    play_random_draft(game, rng, 11)
+    assert practice_page.evaluate("code => loadBoard(code)", save_board_legacy(game))
+    while game.history:
+        practice_page.locator("#undoBtn").click()
+        game.undo()
+        turn = practice_page.evaluate("[gameState.currentPlayer, gameState.phase, gameState.placementIndex]")
+        assert turn == [game.current_player, game.phase, game.placement_index]
+
+
+def test_engine_matches_page_save(practice_page: Page, click_hint):
+    """Test that the engine reads the page's saves and agrees on legal moves."""
+    for _ in range(3):
+        click_hint(practice_page, "vertex")
+        click_hint(practice_page, "edge")
+    click_hint(practice_page, "vertex")
+
+    result = practice_page.evaluate("""
+        () => ({
+            saved: saveBoard(),
+            roads: getValidRoadEdges().map(e => e.key)
+        })
+    """)
+    game = load_board(result["saved"])
+    assert save_board(game) == result["saved"]
+    assert [TOPOLOGY.edge_keys[e] for e in game.legal_roads()] == result["roads"]
+
+
+def test_engine_matches_page_seeded_board(page: Page, static_server):
+    """Test that ?seed= boards on the page match the engine's boards."""
+    for seed in (1, 12345, 4294967295):
+        page.goto(f"/catan-practice.html?seed={seed}")
+        result = page.evaluate("""
+            () => ({
+                seed: gameState.seed,
+                resources: gameState.hexes.map(h => h.resource),
+                numbers: gameState.hexes.map(h => h.number),
+                portTypes: gameState.ports.map(p => p.type)
+            })
+        """)
+        board = generate_board(Mulberry32(seed))
+        assert result["seed"] == seed
+        assert result["resources"] == list(board.resources)
+        assert result["numbers"] == list(board.numbers)
+        assert result["portTypes"] == list(board.port_types)
+
+
+@pytest.mark.parametrize("rule", ["red", "same", "pips"])
+def test_page_deal_abandoned_at_first_broken_rule(practice_page: Page, rule):
+    """Test that the page's deal stops at the first token that breaks each board rule."""
+    hexes = breaking_deal(rule)
+    script = scripted_rng(hexes)
+    values = [script() for _ in hexes]
+    draws = practice_page.evaluate("""values => {
+        let draws = 0;
+        const hexes = HEX_POSITIONS.map((pos, index) => ({ index, number: null }));
+        const attempts = assignNumbers(hexes, 1, () => values[draws++]);
+        return attempts === -1 ? draws : null;
+    }""", values)
+    assert draws == len(hexes)
+
+
+def test_extension_map():
+    """Test that the extension map builds a 30-hex board for a six-player draft."""
+    topology = EXTENSION_MAP.topology
+    assert (topology.hex_count, topology.vertex_count, topology.edge_count) == (30, 80, 109)
+    assert len({v for pair in EXTENSION_MAP.port_vertices for v in pair}) == 22
+    rng = random.Random(7)
+    for _ in range(50):
+        board = generate_board(rng.random, EXTENSION_MAP)
+        assert is_valid_board(board.numbers, topology)
+        assert board.resources.count("desert") == 2
+        assert sorted(n for n in board.numbers if n is not None) == sorted(EXTENSION_MAP.number_tokens)
+
+    game = Game(board)
+    players = []
+    while game.phase != "done":
+        if game.phase == "settlement":
+            players.append(game.current_player)
+        game.play(rng.choice(game.legal_moves()))
+    assert players == [1, 2, 3, 4, 5, 6, 6, 5, 4, 3, 2, 1]
+    loaded = load_board(save_board(game))
+    assert loaded.board == game.board
+    assert loaded.history == game.history
+    assert save_board(loaded) == save_board(game)
+
+
+def test_large_maps_rejected():
+    """Test that maps too large for the page's move codes are refused."""
+    radius = 26  # 2107 hexes: 4374 vertices, 6480 edges
+    positions = [(q, r) for q in range(-radius, radius + 1) for r in range(-radius, radius + 1)
+                 if abs(q + r) <= radius]
+    with pytest.raises(ValueError):
+        build_topology(positions)
+    assert build_topology(positions[:100]).hex_count == 100
+
+
+def test_engine_matches_page_extension_map(page: Page, static_server, click_hint):
+    """Test that ?map=extension boards and saves on the page match the engine's."""
+    page.goto("/catan-practice.html?map=extension&seed=7")
+    for _ in range(7):
+        click_hint(page, "vertex")
+        click_hint(page, "edge")
+    result = page.evaluate("""
+        () => ({
+            resources: gameState.hexes.map(h => h.resource),
+            numbers: gameState.hexes.map(h => h.number),
+            portTypes: gameState.ports.map(p => p.type),
+            saved: saveBoard(),
+            player: gameState.currentPlayer
+        })
+    """)
+    board = generate_board(Mulberry32(7), EXTENSION_MAP)
+    assert result["resources"] == list(board.resources)
+    assert result["numbers"] == list(board.numbers)
+    assert result["portTypes"] == list(board.port_types)
+    game = load_board(result["saved"])
+    assert game.board == board
+    assert save_board(game) == result["saved"]
+    assert result["player"] == game.current_player == 5
@@ -0,0 +1,62 @@
+import re
+
+import pytest
+from playwright.sync_api import Page, expect
+
+from tools.catan import NUMBER_PROBABILITY, NUMBER_TOKENS, TOPOLOGY, generate_board
+from tools.catan.evaluate import evaluate_vertices, resource_production
+from tools.catan.rng import Mulberry32
+
+
+def test_vertex_scores_cover_the_board():
+    """Test that every hex's pips are counted at each of its six corners."""
+    board = generate_board(Mulberry32(3))
+    scores = evaluate_vertices(board)
+    assert len(scores) == TOPOLOGY.vertex_count
+    total_pips = sum(NUMBER_PROBABILITY[n] for n in NUMBER_TOKENS)
+    assert sum(resource_production(board).values()) == total_pips
+    assert sum(s.pips for s in scores) == 6 * total_pips
+    # Scarcity weights average out: each resource's weighted pips equal the mean production
+    assert sum(s.scarcity for s in scores) == pytest.approx(6 * total_pips)
+    assert all(0 <= s.diversity <= 3 for s in scores)
+    assert all(s.port == 0 for v, s in enumerate(scores) if board.vertex_ports()[v] is None)
+
+
+def test_page_scores_match_engine(practice_page: Page):
+    """Test that the page's vertex scores match the engine's."""
+    practice_page.evaluate("resetPractice(42)")
+    result = practice_page.evaluate("""
+        () => {
+            const { pips, diversity, total } = getEvaluation();
+            return { pips: [...pips], diversity: [...diversity], total: [...total] };
+        }
+    """)
+    scores = evaluate_vertices(generate_board(Mulberry32(42)))
+    assert result["pips"] == [s.pips for s in scores]
+    assert result["diversity"] == [s.diversity for s in scores]
+    assert result["total"] == pytest.approx([s.total for s in scores], abs=1e-4)
+
+
+def test_heatmap_toggle(practice_page: Page):
+    """Test that the heat map toggle colours the settlement hints."""
+    expect(practice_page.locator("#board")).not_to_have_class("heatmap")
+    practice_page.locator("#heatmapToggle").check()
+    expect(practice_page.locator("#board")).to_have_class("heatmap")
+    hint = practice_page.locator("#board .vertex-hint").first
+    assert "--heat" in hint.get_attribute("style")
+
+
+def test_hovered_hint_shows_score(practice_page: Page):
+    """Test that the hint under the pointer is outlined with its score breakdown as a tooltip."""
+    practice_page.evaluate("resetPractice(42)")
+    target = practice_page.evaluate("""() => {
+        const v = getValidSettlementVertices()[0].index;
+        const point = new DOMPoint(TOPOLOGY.vertexX[v], TOPOLOGY.vertexY[v])
+            .matrixTransform(document.getElementById('board').getScreenCTM());
+        return { x: point.x, y: point.y, v };
+    }""")
+    practice_page.mouse.move(target["x"], target["y"])
+    hover = practice_page.locator("#board .hit-hover")
+    expect(hover).to_have_count(1)
+    score = evaluate_vertices(generate_board(Mulberry32(42)))[target["v"]]
+    expect(hover.locator("title")).to_have_text(re.compile(rf"^Score {score.total:.1f}: {score.pips} pips"))
@@ -0,0 +1,128 @@
+"""Differential fuzzing of catan-practice.html against tools.catan.
+
+Random cases (a board seed, the skip-roads setting, a list of move choices
+and a random number layout) run through the page in batches of
+FUZZ_BATCH_SIZE per ``page.evaluate`` and through the Python engine. Both
+sides must agree on the board, port placements, every legal-move list, the
+turn, the save code and the board-validity verdict. Choices divisible by
+UNDO_EVERY undo the last action instead of playing, so undo is covered too.
+
+``--fuzz-cases`` sets the number of cases and ``--fuzz-seed`` replays a run.
+"""
+import random
+
+import pytest
+from playwright.sync_api import Page
+
+from tools.catan import NUMBER_TOKENS, Game, Mulberry32, generate_board, is_valid_board, save_board
+
+FUZZ_BATCH_SIZE = 1000
+CHOICES_PER_CASE = 24
+UNDO_EVERY = 6
+
+# Plays each case on the page with drawing switched off
+PAGE_RUNNER = """
+    (cases) => {
+        const draw = [render, updateUI];
+        render = updateUI = () => {};
+        const skipRoads = document.getElementById('skipRoadsToggle');
+        try {
+            return cases.map(({ seed, skipRoads: skip, choices, numbers }) => {
+                generateBoard(seed);
+                resetPlacements();
+                skipRoads.checked = skip;
+                const legal = [];
+                for (const choice of choices) {
+                    if (choice % UNDO_EVERY === 0 && gameState.history.length > 0) {
+                        undo();
+                        legal.push('undo');
+                        continue;
+                    }
+                    if (gameState.phase === 'done') break;
+                    const moves = gameState.phase === 'settlement'
+                        ? getValidSettlementVertices().map(v => v.key)
+                        : getValidRoadEdges().map(e => e.key);
+                    const indices = moves.map(key => gameState.phase === 'settlement'
+                        ? gameState.vertices.get(key).index
+                        : gameState.edges.get(key).index);
+                    legal.push(indices);
+                    if (gameState.phase === 'settlement') placeSettlement(moves[choice % moves.length]);
+                    else placeRoad(moves[choice % moves.length]);
+                }
+                return {
+                    resources: gameState.hexes.map(h => h.resource),
+                    numbers: gameState.hexes.map(h => h.number),
+                    ports: gameState.ports.map(p => [
+                        p.type, gameState.vertices.get(p.vertex1Key).index, gameState.vertices.get(p.vertex2Key).index
+                    ]),
+                    legal,
+                    turn: [gameState.placementIndex, gameState.currentPlayer, gameState.phase],
+                    save: saveBoard(),
+                    valid: isValidBoard(numbers.map(number => ({ number })))
+                };
+            });
+        } finally {
+            [render, updateUI] = draw;
+            skipRoads.checked = false;
+            render();
+            updateUI();
+        }
+    }
+""".replace("UNDO_EVERY", str(UNDO_EVERY))
+
+
+def make_case(rng):
+    numbers = rng.sample(NUMBER_TOKENS, len(NUMBER_TOKENS))
+    numbers.insert(rng.randrange(len(numbers) + 1), None)
+    return {
+        "seed": rng.getrandbits(32),
+        "skipRoads": rng.random() < 0.25,
+        "choices": [rng.getrandbits(16) for _ in range(CHOICES_PER_CASE)],
+        "numbers": numbers,
+    }
+
+
+def run_engine(case):
+    """The engine's view of a case, in the page runner's format."""
+    board = generate_board(Mulberry32(case["seed"]))
+    game = Game(board, skip_roads=case["skipRoads"])
+    legal = []
+    for choice in case["choices"]:
+        if choice % UNDO_EVERY == 0 and game.history:
+            game.undo()
+            legal.append("undo")
+            continue
+        if game.phase == "done":
+            break
+        moves = game.legal_moves()
+        legal.append([index for _, index in moves])
+        game.play(moves[choice % len(moves)])
+    return {
+        "resources": list(board.resources),
+        "numbers": list(board.numbers),
+        "ports": [list(port) for port in board.ports()],
+        "legal": legal,
+        "turn": [game.placement_index, game.current_player, game.phase],
+        "save": save_board(game),
+        "valid": is_valid_board(case["numbers"]),
+    }
+
+
+@pytest.fixture
+def fuzz_seed(pytestconfig):
+    seed = pytestconfig.getoption("--fuzz-seed")
+    return random.getrandbits(32) if seed is None else seed
+
+
+def test_page_matches_engine(practice_page: Page, pytestconfig, fuzz_seed):
+    """Test that random games play out identically on the page and in the engine."""
+    rng = random.Random(fuzz_seed)
+    cases = [make_case(rng) for _ in range(pytestconfig.getoption("--fuzz-cases"))]
+    for start in range(0, len(cases), FUZZ_BATCH_SIZE):
+        batch = cases[start:start + FUZZ_BATCH_SIZE]
+        for k, (case, page_result) in enumerate(zip(batch, practice_page.evaluate(PAGE_RUNNER, batch))):
+            engine_result = run_engine(case)
+            for field, expected in engine_result.items():
+                assert page_result[field] == expected, (
+                    f"case {start + k} ({case}) differs in {field}; rerun with --fuzz-seed={fuzz_seed}"
+                )
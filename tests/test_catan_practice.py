@@ -1,181 +1,210 @@
 from playwright.sync_api import Page, expect
 
 
-def test_page_loads(page: Page, static_server):
+def test_page_loads(practice_page: Page):
     """Test that the page loads with correct title."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    expect(page.locator("h1")).to_have_text("Catan Placement Practice")
+    expect(practice_page.locator("h1")).to_have_text("Catan Placement Practice")
 
 
-def test_initial_state(page: Page, static_server):
+def test_initial_state(practice_page: Page):
     """Test initial game state shows Player 1 placing settlement."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    expect(page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
-    expect(page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
-    expect(page.locator("#settlementCount")).to_have_text("0")
-    expect(page.locator("#roadCount")).to_have_text("0")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
+    expect(practice_page.locator("#settlementCount")).to_have_text("0")
+    expect(practice_page.locator("#roadCount")).to_have_text("0")
 
 
-def test_board_renders_hexes(page: Page, static_server):
+def test_board_renders_hexes(practice_page: Page):
     """Test that the board renders 19 hex tiles."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    hexes = page.locator("#board .hex")
+    hexes = practice_page.locator("#board .hex")
     expect(hexes).to_have_count(19)
 
 
-def test_settlement_hints_visible(page: Page, static_server):
+def test_settlement_hints_visible(practice_page: Page):
     """Test that settlement placement hints are visible initially."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    hints = page.locator("#board .vertex-hint")
-    # Should have multiple valid settlement spots
-    count = hints.count()
-    assert count > 0, "Should show settlement placement hints"
+    # One path per heat level, outlining every valid settlement spot
+    outlines = practice_page.locator("#board .vertex-hint").evaluate_all(
+        "paths => paths.map(path => path.getAttribute('d') || '')"
+    )
+    assert "".join(outlines).count("M") == practice_page.evaluate("getValidSettlementVertices().length") > 0
+
+
+def test_hints_are_a_fixed_set_of_paths(practice_page: Page, click_hint):
+    """Test that hints are drawn as a few paths that ignore the pointer, however many are shown."""
+    expect(practice_page.locator("#board .vertex-hint")).to_have_count(practice_page.evaluate("HEAT_LEVELS"))
+    expect(practice_page.locator("#board .edge-hint")).to_have_count(1)
+    click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#board .vertex-hint")).to_have_count(practice_page.evaluate("HEAT_LEVELS"))
+    expect(practice_page.locator("#board .edge-hint")).to_have_count(1)
+    assert practice_page.locator("#board .edge-hint").get_attribute("d").count("M") == practice_page.evaluate(
+        "boardView.edgeHintsShown.length"
+    )
+    assert practice_page.locator("#board .edge-hint").evaluate("path => getComputedStyle(path).pointerEvents") == "none"
 
 
-def test_place_settlement(page: Page, static_server):
+def test_place_settlement(practice_page: Page, click_hint):
     """Test placing a settlement."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Click first available settlement hint
-    hint = page.locator("#board .vertex-hint").first
-    hint.click()
+    click_hint(practice_page, "vertex")
 
     # Should now be in road placement phase
-    expect(page.locator("#phaseInfo")).to_have_text("Place a road")
-    expect(page.locator("#settlementCount")).to_have_text("1")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place a road")
+    expect(practice_page.locator("#settlementCount")).to_have_text("1")
 
     # Settlement should be visible
-    settlements = page.locator("#board .settlement")
+    settlements = practice_page.locator("#board .settlement")
     expect(settlements).to_have_count(1)
 
 
-def test_place_road(page: Page, static_server):
+def test_place_road(practice_page: Page, click_hint):
     """Test placing a road after settlement."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Place settlement
-    page.locator("#board .vertex-hint").first.click()
+    click_hint(practice_page, "vertex")
 
-    # Wait for road hints to appear and click
-    # Use force=True because SVG line elements can be thin
-    road_hint = page.locator("#board .edge-hint").first
-    road_hint.click(force=True)
+    # Click a road hint
+    click_hint(practice_page, "edge")
 
     # Should move to Player 2
-    expect(page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
-    expect(page.locator("#roadCount")).to_have_text("1")
-
-
-def test_undo_settlement(page: Page, static_server):
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
+    expect(practice_page.locator("#roadCount")).to_have_text("1")
+
+
+# Screen position of a point `d` board units from the middle of the first
+# road hint, at right angles to the road
+ROAD_HINT_OFFSET_POINT = """(d) => {
+    const e = boardView.edgeHintsShown[0];
+    const v1 = TOPOLOGY.edgeVertices[e * 2], v2 = TOPOLOGY.edgeVertices[e * 2 + 1];
+    const dx = TOPOLOGY.vertexX[v2] - TOPOLOGY.vertexX[v1], dy = TOPOLOGY.vertexY[v2] - TOPOLOGY.vertexY[v1];
+    const length = Math.hypot(dx, dy);
+    const point = new DOMPoint(
+        (TOPOLOGY.vertexX[v1] + TOPOLOGY.vertexX[v2]) / 2 - dy / length * d,
+        (TOPOLOGY.vertexY[v1] + TOPOLOGY.vertexY[v2]) / 2 + dx / length * d
+    ).matrixTransform(document.getElementById('board').getScreenCTM());
+    return { x: point.x, y: point.y, key: TOPOLOGY.edgeKeys[e] };
+}"""
+
+
+def test_click_near_road_hint(practice_page: Page, click_hint):
+    """Test that a click beside a road hint, off its line, places that road."""
+    click_hint(practice_page, "vertex")
+    target = practice_page.evaluate(ROAD_HINT_OFFSET_POINT, 5)
+    practice_page.mouse.click(target["x"], target["y"])
+    expect(practice_page.locator("#roadCount")).to_have_text("1")
+    assert practice_page.evaluate("gameState.edges.get(gameState.history.at(-1).key).road.player") == 1
+
+
+def test_click_away_from_hints_does_nothing(practice_page: Page, click_hint):
+    """Test that a click outside the hit radius of every hint places nothing."""
+    click_hint(practice_page, "vertex")
+    target = practice_page.evaluate(ROAD_HINT_OFFSET_POINT, 40)
+    practice_page.mouse.click(target["x"], target["y"])
+    expect(practice_page.locator("#roadCount")).to_have_text("0")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place a road")
+
+
+def test_hit_radius_by_pointer_type(practice_page: Page):
+    """Test that hitTest picks the nearest shown vertex only within the radius."""
+    result = practice_page.evaluate("""() => {
+        const v = getValidSettlementVertices()[0].index;
+        const x = TOPOLOGY.vertexX[v] + 15, y = TOPOLOGY.vertexY[v];
+        return { v, mouse: hitTest(x, y, HIT_RADIUS.mouse), touch: hitTest(x, y, HIT_RADIUS.touch) };
+    }""")
+    assert result["mouse"] is None
+    assert result["touch"] == {"type": "vertex", "index": result["v"]}
+
+
+def test_undo_settlement(practice_page: Page, click_hint):
     """Test undoing a settlement placement."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Place settlement
-    page.locator("#board .vertex-hint").first.click()
-    expect(page.locator("#settlementCount")).to_have_text("1")
+    click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#settlementCount")).to_have_text("1")
 
     # Undo
-    page.locator("#undoBtn").click()
-    expect(page.locator("#settlementCount")).to_have_text("0")
-    expect(page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
+    practice_page.locator("#undoBtn").click()
+    expect(practice_page.locator("#settlementCount")).to_have_text("0")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
 
 
-def test_undo_road(page: Page, static_server):
+def test_undo_road(practice_page: Page, click_hint):
     """Test undoing a road placement."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Place settlement and road
-    page.locator("#board .vertex-hint").first.click()
-    page.locator("#board .edge-hint").first.click(force=True)
-    expect(page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
+    click_hint(practice_page, "vertex")
+    click_hint(practice_page, "edge")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
 
     # Undo road
-    page.locator("#undoBtn").click()
-    expect(page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
-    expect(page.locator("#phaseInfo")).to_have_text("Place a road")
+    practice_page.locator("#undoBtn").click()
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place a road")
 
 
-def test_undo_disabled_initially(page: Page, static_server):
+def test_undo_disabled_initially(practice_page: Page):
     """Test that undo is disabled when no actions taken."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    expect(page.locator("#undoBtn")).to_be_disabled()
+    expect(practice_page.locator("#undoBtn")).to_be_disabled()
 
 
-def test_new_board_no_confirm_when_empty(page: Page, static_server):
+def test_new_board_no_confirm_when_empty(practice_page: Page):
     """Test new board doesn't show confirmation when no placements."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Click new board - should not show modal
-    page.locator("#newBoardBtn").click()
+    practice_page.locator("#newBoardBtn").click()
 
     # Modal should not be visible
-    expect(page.locator("#confirmModal")).not_to_have_class("visible")
+    expect(practice_page.locator("#confirmModal")).to_be_hidden()
 
 
-def test_new_board_confirms_when_placements_exist(page: Page, static_server):
+def test_new_board_confirms_when_placements_exist(practice_page: Page, click_hint):
     """Test new board shows confirmation when placements exist."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Place a settlement
-    page.locator("#board .vertex-hint").first.click()
+    click_hint(practice_page, "vertex")
 
     # Click new board - should show modal
-    page.locator("#newBoardBtn").click()
-    expect(page.locator("#confirmModal")).to_have_class("modal-overlay visible")
+    practice_page.locator("#newBoardBtn").click()
+    expect(practice_page.locator("#confirmModal")).to_have_class("modal-overlay visible")
 
 
-def test_confirm_cancel_closes_modal(page: Page, static_server):
+def test_confirm_cancel_closes_modal(practice_page: Page, click_hint):
     """Test cancel button closes confirmation modal."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
+    click_hint(practice_page, "vertex")
+    practice_page.locator("#newBoardBtn").click()
+    practice_page.locator("#confirmCancel").click()
 
-    page.locator("#board .vertex-hint").first.click()
-    page.locator("#newBoardBtn").click()
-    page.locator("#confirmCancel").click()
-
-    expect(page.locator("#confirmModal")).not_to_have_class("visible")
+    expect(practice_page.locator("#confirmModal")).not_to_have_class("visible")
     # Settlement should still exist
-    expect(page.locator("#settlementCount")).to_have_text("1")
+    expect(practice_page.locator("#settlementCount")).to_have_text("1")
 
 
-def test_confirm_yes_generates_new_board(page: Page, static_server):
+def test_confirm_yes_generates_new_board(practice_page: Page, click_hint):
     """Test confirming new board clears placements."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    page.locator("#board .vertex-hint").first.click()
-    page.locator("#newBoardBtn").click()
-    page.locator("#confirmYes").click()
+    click_hint(practice_page, "vertex")
+    practice_page.locator("#newBoardBtn").click()
+    practice_page.locator("#confirmYes").click()
 
-    expect(page.locator("#confirmModal")).not_to_have_class("visible")
-    expect(page.locator("#settlementCount")).to_have_text("0")
-    expect(page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
+    expect(practice_page.locator("#confirmModal")).not_to_have_class("visible")
+    expect(practice_page.locator("#settlementCount")).to_have_text("0")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 1 (Red)")
 
 
-def test_save_button_exists(page: Page, static_server):
+def test_save_button_exists(practice_page: Page):
     """Test save button is present."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    expect(page.locator("#saveBtn")).to_be_visible()
-    expect(page.locator("#saveBtn")).to_have_text("Copy Board to Clipboard")
+    expect(practice_page.locator("#saveBtn")).to_be_visible()
+    expect(practice_page.locator("#saveBtn")).to_have_text("Copy Board to Clipboard")
 
 
-def test_load_modal_opens(page: Page, static_server):
+def test_load_modal_opens(practice_page: Page):
     """Test load button opens modal."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    page.locator("#loadBtn").click()
-    expect(page.locator("#loadModal")).to_have_class("modal-overlay visible")
+    practice_page.locator("#loadBtn").click()
+    expect(practice_page.locator("#loadModal")).to_have_class("modal-overlay visible")
 
 
-def test_load_modal_cancel(page: Page, static_server):
+def test_load_modal_cancel(practice_page: Page):
     """Test load modal can be cancelled."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    page.locator("#loadBtn").click()
-    page.locator("#loadCancel").click()
-    expect(page.locator("#loadModal")).not_to_have_class("visible")
+    practice_page.locator("#loadBtn").click()
+    practice_page.locator("#loadCancel").click()
+    expect(practice_page.locator("#loadModal")).not_to_have_class("visible")
 
 
-def test_snake_draft_order(page: Page, static_server):
+def test_snake_draft_order(practice_page: Page, click_hint):
     """Test the snake draft placement order (1-2-3-4-4-3-2-1)."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     expected_order = [
         ("Player 1 (Red)", "1st"),
         ("Player 2 (Blue)", "1st"),
@@ -188,25 +217,25 @@ def test_snake_draft_order(page: Page, static_server):
     ]
 
     for i, (player, placement) in enumerate(expected_order):
-        expect(page.locator("#currentPlayer")).to_have_text(player)
-        expect(page.locator("#phaseInfo")).to_contain_text(f"{placement} settlement")
+        expect(practice_page.locator("#currentPlayer")).to_have_text(player)
+        expect(practice_page.locator("#phaseInfo")).to_contain_text(f"{placement} settlement")
 
         # Place settlement
-        page.locator("#board .vertex-hint").first.click()
-        expect(page.locator("#phaseInfo")).to_have_text("Place a road")
+        click_hint(practice_page, "vertex")
+        expect(practice_page.locator("#phaseInfo")).to_have_text("Place a road")
 
-        # Place road - use force=True for thin SVG lines
-        page.locator("#board .edge-hint").first.click(force=True)
+        # Place road
+        click_hint(practice_page, "edge")
 
     # After all placements, setup should be complete
-    expect(page.locator("#currentPlayer")).to_have_text("Setup Complete!")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Setup Complete!")
 
 
 def test_board_visible_on_mobile(page: Page, static_server):
     """Test that the board is fully visible on mobile viewport without horizontal scrolling."""
     # Set mobile viewport (iPhone SE size)
     page.set_viewport_size({"width": 375, "height": 667})
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
+    page.goto("/catan-practice.html")
 
     # Get the board element
     board = page.locator("#board")
@@ -232,7 +261,7 @@ def test_board_visible_on_small_mobile(page: Page, static_server):
     """Test board visibility on very small mobile viewport (320px width)."""
     # Set very small mobile viewport
     page.set_viewport_size({"width": 320, "height": 568})
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
+    page.goto("/catan-practice.html")
 
     board = page.locator("#board")
     expect(board).to_be_visible()
@@ -246,34 +275,29 @@ def test_board_visible_on_small_mobile(page: Page, static_server):
     )
 
 
-def test_skip_roads_toggle_exists(page: Page, static_server):
+def test_skip_roads_toggle_exists(practice_page: Page):
     """Test that the skip roads toggle exists."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-    expect(page.locator("#skipRoadsToggle")).to_be_visible()
+    expect(practice_page.locator("#skipRoadsToggle")).to_be_visible()
 
 
-def test_skip_roads_toggle_skips_road_phase(page: Page, static_server):
+def test_skip_roads_toggle_skips_road_phase(practice_page: Page, click_hint):
     """Test that enabling skip roads toggle skips road placement phase."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Enable skip roads toggle
-    page.locator("#skipRoadsToggle").check()
+    practice_page.locator("#skipRoadsToggle").check()
 
     # Place settlement
-    page.locator("#board .vertex-hint").first.click()
+    click_hint(practice_page, "vertex")
 
     # Should skip road phase and go directly to Player 2
-    expect(page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
-    expect(page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
-    expect(page.locator("#roadCount")).to_have_text("0")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 2 (Blue)")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
+    expect(practice_page.locator("#roadCount")).to_have_text("0")
 
 
-def test_skip_roads_toggle_full_draft(page: Page, static_server):
+def test_skip_roads_toggle_full_draft(practice_page: Page, click_hint):
     """Test skip roads toggle allows completing full draft without roads."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Enable skip roads toggle
-    page.locator("#skipRoadsToggle").check()
+    practice_page.locator("#skipRoadsToggle").check()
 
     expected_players = [
         "Player 1 (Red)",
@@ -287,21 +311,19 @@ def test_skip_roads_toggle_full_draft(page: Page, static_server):
     ]
 
     for player in expected_players:
-        expect(page.locator("#currentPlayer")).to_have_text(player)
-        page.locator("#board .vertex-hint").first.click()
+        expect(practice_page.locator("#currentPlayer")).to_have_text(player)
+        click_hint(practice_page, "vertex")
 
     # After all placements, setup should be complete
-    expect(page.locator("#currentPlayer")).to_have_text("Setup Complete!")
-    expect(page.locator("#settlementCount")).to_have_text("8")
-    expect(page.locator("#roadCount")).to_have_text("0")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Setup Complete!")
+    expect(practice_page.locator("#settlementCount")).to_have_text("8")
+    expect(practice_page.locator("#roadCount")).to_have_text("0")
 
 
-def test_board_validation_six_eight_not_adjacent(page: Page, static_server):
+def test_board_validation_six_eight_not_adjacent(practice_page: Page):
     """Test that 6 and 8 are never adjacent on the generated board."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Check board validation via JavaScript
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             // Get all pairs of adjacent hexes with numbers
             for (let i = 0; i < gameState.hexes.length; i++) {
@@ -326,11 +348,9 @@ def test_board_validation_six_eight_not_adjacent(page: Page, static_server):
     assert result["valid"], result.get("error", "Unknown validation error")
 
 
-def test_board_validation_same_numbers_not_adjacent(page: Page, static_server):
+def test_board_validation_same_numbers_not_adjacent(practice_page: Page):
     """Test that same numbers are never adjacent on the generated board."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             for (let i = 0; i < gameState.hexes.length; i++) {
                 const hex = gameState.hexes[i];
@@ -353,11 +373,9 @@ def test_board_validation_same_numbers_not_adjacent(page: Page, static_server):
     assert result["valid"], result.get("error", "Unknown validation error")
 
 
-def test_board_validation_no_13_pips_vertex(page: Page, static_server):
+def test_board_validation_no_13_pips_vertex(practice_page: Page):
     """Test that no vertex has 13 or more pips."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             const vertexMap = getVerticesWithAdjacentHexes(gameState.hexes);
 
@@ -383,16 +401,14 @@ def test_board_validation_no_13_pips_vertex(page: Page, static_server):
     assert result["valid"], result.get("error", "Unknown validation error")
 
 
-def test_board_validation_multiple_boards(page: Page, static_server):
+def test_board_validation_multiple_boards(practice_page: Page):
     """Test that multiple board generations all pass validation."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Generate and validate 10 boards
     for i in range(10):
-        page.locator("#newBoardBtn").click()
+        practice_page.locator("#newBoardBtn").click()
 
         # Check all validation rules
-        result = page.evaluate("""
+        result = practice_page.evaluate("""
             () => {
                 return isValidBoard(gameState.hexes);
             }
@@ -400,20 +416,104 @@ def test_board_validation_multiple_boards(page: Page, static_server):
         assert result, f"Board {i + 1} failed validation"
 
 
-def test_ports_are_rendered(page: Page, static_server):
-    """Test that port indicators are rendered on the board."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
+def test_generate_board_always_valid(practice_page: Page):
+    """Test that generateBoard always produces a valid board."""
+    result = practice_page.evaluate("""
+        () => {
+            for (let i = 0; i < 200; i++) {
+                generateBoard();
+                if (!isValidBoard(gameState.hexes)) {
+                    return { valid: false, error: `Board ${i + 1} failed validation` };
+                }
+                if (gameState.hexes[gameState.robberHex].resource !== 'desert') {
+                    return { valid: false, error: `Robber not on desert for board ${i + 1}` };
+                }
+            }
+            return { valid: true };
+        }
+    """)
+    assert result["valid"], result.get("error", "Unknown validation error")
+
 
+def test_topology_tables(practice_page: Page):
+    """Test that the precomputed board topology is consistent."""
+    result = practice_page.evaluate("""
+        () => {
+            const t = TOPOLOGY;
+            for (let e = 0; e < t.edgeCount; e++) {
+                const v1 = t.edgeVertices[e * 2];
+                const v2 = t.edgeVertices[e * 2 + 1];
+                const neighbors = Array.from(t.vertexNeighbors.slice(v1 * 3, v1 * 3 + 3));
+                const edges = Array.from(t.vertexEdges.slice(v2 * 3, v2 * 3 + 3));
+                if (!neighbors.includes(v2) || !edges.includes(e)) {
+                    return { valid: false, error: `Edge ${e} missing from vertex tables` };
+                }
+            }
+            return {
+                valid: true,
+                counts: [t.hexCount, t.vertexCount, t.edgeCount],
+                vertexMapSize: gameState.vertices.size,
+                edgeMapSize: gameState.edges.size
+            };
+        }
+    """)
+    assert result["valid"], result.get("error", "Unknown topology error")
+    assert result["counts"] == [19, 54, 72]
+    assert result["vertexMapSize"] == 54
+    assert result["edgeMapSize"] == 72
+
+
+def test_blocked_vertex_index_matches_distance_rule(practice_page: Page, click_hint):
+    """Test that the blocked-vertex index tracks placements and undo."""
+    practice_page.locator("#skipRoadsToggle").check()
+
+    for _ in range(5):
+        click_hint(practice_page, "vertex")
+    practice_page.locator("#undoBtn").click()
+    practice_page.locator("#undoBtn").click()
+    click_hint(practice_page, "vertex")
+
+    result = practice_page.evaluate("""
+        () => gameState.vertexList.every(v => {
+            const nearSettlement = gameState.vertexList.some(o =>
+                o.settlement && Math.hypot(o.x - v.x, o.y - v.y) < HEX_SIZE * 1.1);
+            return isValidSettlementVertex(v.index) === (!v.settlement && !nearSettlement);
+        })
+    """)
+    assert result, "Blocked-vertex index disagrees with the distance rule"
+
+
+def test_render_patches_board_in_place(practice_page: Page, click_hint):
+    """Test that placements and undo patch the board instead of redrawing it."""
+    practice_page.evaluate("() => { window.firstHex = document.querySelector('#board .hex'); }")
+    click_hint(practice_page, "vertex")
+    click_hint(practice_page, "edge")
+    practice_page.locator("#undoBtn").click()
+
+    expect(practice_page.locator("#board .settlement")).to_have_count(1)
+    expect(practice_page.locator("#board .road")).to_have_count(0)
+    assert practice_page.evaluate("() => document.querySelector('#board .hex') === window.firstHex"), (
+        "Hex layer should not be rebuilt by placements"
+    )
+
+    # A new board redraws the static layers
+    practice_page.locator("#newBoardBtn").click()
+    practice_page.locator("#confirmYes").click()
+    expect(practice_page.locator("#board .hex")).to_have_count(19)
+    expect(practice_page.locator("#board .settlement")).to_have_count(0)
+    assert practice_page.evaluate("() => !window.firstHex.isConnected")
+
+
+def test_ports_are_rendered(practice_page: Page):
+    """Test that port indicators are rendered on the board."""
     # Port indicators should be visible (2 per port = 18 total for 9 ports)
-    port_indicators = page.locator("#board .port-indicator")
+    port_indicators = practice_page.locator("#board .port-indicator")
     expect(port_indicators).to_have_count(18)
 
 
-def test_ports_count(page: Page, static_server):
+def test_ports_count(practice_page: Page):
     """Test that exactly 9 ports are generated."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             return gameState.ports.length;
         }
@@ -421,11 +521,9 @@ def test_ports_count(page: Page, static_server):
     assert result == 9, f"Expected 9 ports, got {result}"
 
 
-def test_port_types_distribution(page: Page, static_server):
+def test_port_types_distribution(practice_page: Page):
     """Test that ports have correct type distribution (4x 3:1, 5x resource)."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             const typeCounts = {};
             for (const port of gameState.ports) {
@@ -444,17 +542,15 @@ def test_port_types_distribution(page: Page, static_server):
         assert result.get(resource, 0) == 1, f"Expected 1 {resource} port, got {result.get(resource, 0)}"
 
 
-def test_port_types_randomized(page: Page, static_server):
+def test_port_types_randomized(practice_page: Page):
     """Test that port types are randomized between board generations."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
     # Get port types for multiple boards
     port_type_configs = []
     for i in range(5):
         if i > 0:
-            page.locator("#newBoardBtn").click()
+            practice_page.locator("#newBoardBtn").click()
 
-        types = page.evaluate("""
+        types = practice_page.evaluate("""
             () => gameState.ports.map(p => p.type)
         """)
         port_type_configs.append(tuple(types))
@@ -464,11 +560,9 @@ def test_port_types_randomized(page: Page, static_server):
     assert len(unique_configs) >= 2, "Port types should be randomized between board generations"
 
 
-def test_ports_at_coastal_edges(page: Page, static_server):
+def test_ports_at_coastal_edges(practice_page: Page):
     """Test that all ports are at coastal edges (facing water)."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             // Check each port position is at a coastal edge
             const HEX_DIRECTIONS_BY_EDGE = [
@@ -501,11 +595,9 @@ def test_ports_at_coastal_edges(page: Page, static_server):
     assert result["valid"], result.get("error", "Unknown error")
 
 
-def test_ports_not_adjacent(page: Page, static_server):
+def test_ports_not_adjacent(practice_page: Page):
     """Test that ports have at least one vertex between them (not on consecutive edges)."""
-    page.goto("http://127.0.0.1:8123/catan-practice.html")
-
-    result = page.evaluate("""
+    result = practice_page.evaluate("""
         () => {
             // Get all port vertex positions
             const portVertices = gameState.ports.map(port => ({
@@ -553,3 +645,320 @@ def test_ports_not_adjacent(page: Page, static_server):
         }
     """)
     assert result["valid"], result.get("error", "Unknown error")
+
+
+def test_suggest_placement(practice_page: Page, click_hint):
+    """Test that the solver suggests a legal settlement and clears it after a move."""
+    practice_page.evaluate("resetPractice(42)")
+    practice_page.locator("#suggestBtn").click()
+    expect(practice_page.locator("#suggestionInfo")).to_contain_text("Best for Player 1")
+    expect(practice_page.locator("#board .suggestion-marker")).to_have_count(1)
+
+    move = practice_page.evaluate("solver.suggestion.move")
+    assert practice_page.evaluate(f"isValidSettlementVertex({move})")
+
+    click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#board .suggestion-marker")).to_have_count(0)
+    expect(practice_page.locator("#suggestBtn")).to_be_disabled()
+
+
+def test_position_key_follows_undo(practice_page: Page, click_hint):
+    """Test that undo restores the previous position key and reloading a save keeps it."""
+    practice_page.evaluate("resetPractice(42)")
+    keys = [practice_page.evaluate("positionKey()")]
+    for _ in range(3):
+        click_hint(practice_page, "vertex")
+        keys.append(practice_page.evaluate("positionKey()"))
+        click_hint(practice_page, "edge")
+        keys.append(practice_page.evaluate("positionKey()"))
+    assert len(set(keys)) == len(keys)
+
+    saved = practice_page.evaluate("saveBoard()")
+    practice_page.evaluate("generateBoard(7); resetPlacements(); render(); updateUI()")
+    assert practice_page.evaluate(f"loadBoard('{saved}') && positionKey()") == keys[-1]
+
+    for expected in reversed(keys[:-1]):
+        practice_page.locator("#undoBtn").click()
+        assert practice_page.evaluate("positionKey()") == expected
+
+
+def test_suggestion_cached_across_undo(practice_page: Page, click_hint):
+    """Test that returning to a solved position shows the cached suggestion without searching."""
+    practice_page.evaluate("resetPractice(42)")
+    practice_page.locator("#suggestBtn").click()
+    practice_page.wait_for_function("solver.suggestion && !solver.running", timeout=10000)
+    move = practice_page.evaluate("solver.suggestion.move")
+
+    click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#board .suggestion-marker")).to_have_count(0)
+    hits = practice_page.evaluate("analysisCache.hits")
+    practice_page.locator("#undoBtn").click()
+
+    expect(practice_page.locator("#board .suggestion-marker")).to_have_count(1)
+    assert practice_page.evaluate("solver.running") is False
+    assert practice_page.evaluate("solver.suggestion.move") == move
+    assert practice_page.evaluate("analysisCache.hits") > hits
+
+
+def test_redo_replays_undone_moves(practice_page: Page, click_hint):
+    """Test that redo and the arrow keys step back along the undone line."""
+    practice_page.evaluate("resetPractice(42)")
+    expect(practice_page.locator("#redoBtn")).to_be_disabled()
+    click_hint(practice_page, "vertex")
+    click_hint(practice_page, "edge")
+    key = practice_page.evaluate("positionKey()")
+
+    practice_page.locator("#undoBtn").click()
+    practice_page.locator("#undoBtn").click()
+    expect(practice_page.locator("#settlementCount")).to_have_text("0")
+    expect(practice_page.locator("#redoBtn")).to_be_enabled()
+
+    practice_page.locator("#redoBtn").click()
+    expect(practice_page.locator("#settlementCount")).to_have_text("1")
+    practice_page.keyboard.press("ArrowRight")
+    expect(practice_page.locator("#roadCount")).to_have_text("1")
+    expect(practice_page.locator("#redoBtn")).to_be_disabled()
+    assert practice_page.evaluate("positionKey()") == key
+
+    practice_page.keyboard.press("ArrowLeft")
+    expect(practice_page.locator("#roadCount")).to_have_text("0")
+
+
+def test_history_scrubber_jumps_to_ply(practice_page: Page, click_hint):
+    """Test that the history scrubber jumps to any ply of the current line."""
+    practice_page.evaluate("resetPractice(42)")
+    keys = [practice_page.evaluate("positionKey()")]
+    for _ in range(3):
+        click_hint(practice_page, "vertex")
+        keys.append(practice_page.evaluate("positionKey()"))
+        click_hint(practice_page, "edge")
+        keys.append(practice_page.evaluate("positionKey()"))
+
+    scrubber = practice_page.locator("#historyScrubber")
+    expect(scrubber).to_have_attribute("max", "6")
+    for ply in (1, 5, 0, 6, 3):
+        scrubber.fill(str(ply))
+        assert practice_page.evaluate("gameState.history.length") == ply
+        assert practice_page.evaluate("positionKey()") == keys[ply]
+    expect(scrubber).to_have_attribute("max", "6")
+
+
+def test_new_move_after_undo_starts_a_branch(practice_page: Page, click_hint):
+    """Test that a different move after undo keeps the old line as a selectable branch."""
+    practice_page.evaluate("resetPractice(42)")
+    click_hint(practice_page, "vertex")
+    first = practice_page.evaluate("positionKey()")
+    practice_page.locator("#undoBtn").click()
+    expect(practice_page.locator("#branchSelect")).to_be_hidden()
+
+    click_hint(practice_page, "vertex", 5)
+    second = practice_page.evaluate("positionKey()")
+    expect(practice_page.locator("#redoBtn")).to_be_disabled()
+    practice_page.locator("#undoBtn").click()
+
+    branches = practice_page.locator("#branchSelect")
+    expect(branches).to_be_visible()
+    expect(branches.locator("option")).to_have_count(2)
+    practice_page.locator("#redoBtn").click()
+    assert practice_page.evaluate("positionKey()") == second
+
+    practice_page.locator("#undoBtn").click()
+    branches.select_option(index=0)
+    practice_page.locator("#redoBtn").click()
+    assert practice_page.evaluate("positionKey()") == first
+
+
+def test_skip_roads_undo_restores_turn(practice_page: Page, click_hint):
+    """Test that undo with skip roads returns the turn to the player who placed."""
+    practice_page.locator("#skipRoadsToggle").check()
+    for _ in range(5):
+        click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 3 (Orange)")
+
+    practice_page.locator("#undoBtn").click()
+    practice_page.locator("#undoBtn").click()
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 4 (Green)")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place 1st settlement")
+
+    click_hint(practice_page, "vertex")
+    click_hint(practice_page, "vertex")
+    expect(practice_page.locator("#currentPlayer")).to_have_text("Player 3 (Orange)")
+    expect(practice_page.locator("#phaseInfo")).to_have_text("Place 2nd settlement")
+
+
+def test_drill_next_board_comes_from_queue(practice_page: Page, click_hint):
+    """Test that drill mode fills a board queue in a worker and Next Board dequeues from it."""
+    practice_page.locator("#drillBtn").click()
+    expect(practice_page.locator("#nextBoardBtn")).to_be_visible()
+    practice_page.wait_for_function("drill.queue.length >= DRILL_BATCH_SIZE", timeout=10000)
+
+    seed = practice_page.evaluate("drill.queue[0].seed")
+    click_hint(practice_page, "vertex")
+    practice_page.locator("#nextBoardBtn").click()
+    expect(practice_page.locator("#settlementCount")).to_have_text("0")
+    assert practice_page.evaluate("gameState.seed") == seed
+    assert practice_page.evaluate("isValidBoard(gameState.hexes)")
+    expect(practice_page.locator("#drillInfo")).to_contain_text("Drill board 2")
+
+    practice_page.locator("#drillBtn").click()
+    expect(practice_page.locator("#nextBoardBtn")).to_be_hidden()
+
+
+def test_drill_from_corpus(page: Page, static_server):
+    """Test that ?drill=corpus queues corpus boards with their board numbers."""
+    page.goto("/catan-practice.html?drill=corpus")
+    page.wait_for_function("drill.queue.length >= DRILL_BATCH_SIZE", timeout=10000)
+    number = page.evaluate("drill.queue[0].boardNumber")
+    page.keyboard.press("n")
+    expect(page.locator("#boardNumber")).to_have_text(f"Board #{number}")
+
+
+def test_perf_instrumentation(page: Page, static_server, click_hint):
+    """Test that ?perf=1 records hot-path timings, measures and the overlay."""
+    page.goto("/catan-practice.html?perf=1")
+    click_hint(page, "vertex")
+    click_hint(page, "edge")
+    page.locator("#newBoardBtn").click()
+    page.locator("#confirmYes").click()
+
+    snapshot = page.evaluate("window.__catanPerf.snapshot()")
+    assert snapshot["generateBoard"]["count"] == 2
+    assert snapshot["generateBoard.attempts"]["p50"] >= 1
+    assert snapshot["render"]["count"] >= 4
+    assert snapshot["render.nodesCreated"]["max"] > 0
+    assert snapshot["updateShownHints"]["count"] == snapshot["render"]["count"]
+    assert snapshot["getValidRoadEdges"]["count"] >= 1
+    assert sum(snapshot["render"]["histogram"]) == snapshot["render"]["window"]
+    assert page.evaluate("performance.getEntriesByName('render', 'measure').length") >= 4
+    expect(page.locator("#perfOverlay")).to_contain_text("generateBoard")
+
+
+def test_perf_instrumentation_off_by_default(practice_page: Page):
+    """Test that timings are only recorded with ?perf=1."""
+    assert practice_page.evaluate("window.__catanPerf === undefined")
+    expect(practice_page.locator("#perfOverlay")).to_be_hidden()
+
+
+def test_reset_practice_matches_fresh_load(page: Page, static_server, click_hint):
+    """Test that the page pool's reset hook gives the same state as loading ?seed=N."""
+    page.goto("/catan-practice.html?seed=42")
+    fresh = page.evaluate("[saveBoard(), positionKey()]")
+
+    page.locator("#skipRoadsToggle").check()
+    page.locator("#heatmapToggle").check()
+    for _ in range(3):
+        click_hint(page, "vertex")
+    page.locator("#undoBtn").click()
+    page.locator("#loadBtn").click()
+
+    page.evaluate("resetPractice(42)")
+    assert page.evaluate("[saveBoard(), positionKey()]") == fresh
+    expect(page.locator("#loadModal")).to_be_hidden()
+    expect(page.locator("#skipRoadsToggle")).not_to_be_checked()
+    expect(page.locator("#board")).not_to_have_class("heatmap")
+    expect(page.locator("#redoBtn")).to_be_disabled()
+    expect(page.locator("#undoBtn")).to_be_disabled()
+
+
+# RGB of the canvas pixel under board point (x, y), and the screen position
+# of that point
+CANVAS_PIXEL = """([x, y]) => {
+    const box = boardViewBox();
+    const data = canvasView.context.getImageData(
+        Math.round((x - box.x) * canvasView.scale), Math.round((y - box.y) * canvasView.scale), 1, 1).data;
+    const screen = new DOMPoint(x, y).matrixTransform(document.getElementById('board').getScreenCTM());
+    return { rgb: Array.from(data.slice(0, 3)), screen: [screen.x, screen.y] };
+}"""
+
+
+def hex_rgb(color):
+    return [int(color[i:i + 2], 16) for i in (1, 3, 5)]
+
+
+def test_canvas_renderer_draws_board(page: Page, static_server):
+    """Test that ?renderer=canvas paints the terrain on a canvas under an empty #board."""
+    page.goto("/catan-practice.html?seed=42&renderer=canvas")
+    expect(page.locator("#boardCanvas")).to_be_visible()
+    expect(page.locator("#board *")).to_have_count(0)
+    hexes = page.evaluate("gameState.hexes.map(h => ({ x: h.x, y: h.y, color: RESOURCE_COLORS[h.resource] }))")
+    for hex in hexes:
+        # Above the number token, inside the hex
+        assert page.evaluate(CANVAS_PIXEL, [hex["x"], hex["y"] - 30])["rgb"] == hex_rgb(hex["color"])
+
+
+def test_canvas_renderer_places_by_click(page: Page, static_server):
+    """Test that clicks on the canvas board place pieces and the pieces are painted."""
+    page.goto("/catan-practice.html?seed=42&renderer=canvas")
+    vertex = page.evaluate("(v => ({ x: v.x, y: v.y }))(getValidSettlementVertices()[0])")
+    before = page.evaluate(CANVAS_PIXEL, [vertex["x"], vertex["y"]])
+    page.mouse.click(*before["screen"])
+    expect(page.locator("#settlementCount")).to_have_text("1")
+    assert page.evaluate(CANVAS_PIXEL, [vertex["x"], vertex["y"]])["rgb"] == hex_rgb("#e74c3c")
+    assert page.evaluate("boardView.edgeHintsShown.length") > 0
+
+
+def test_extension_map_six_player_draft(page: Page, static_server, click_hint):
+    """Test that ?map=extension shows the whole 30-hex board and runs a six-player draft."""
+    page.goto("/catan-practice.html?map=extension&seed=7")
+    expect(page.locator("#board .hex")).to_have_count(30)
+    expect(page.locator(".player-dot:visible")).to_have_count(6)
+    for player in range(1, 7):
+        expect(page.locator("#currentPlayer")).to_contain_text(f"Player {player} ")
+        click_hint(page, "vertex")
+        click_hint(page, "edge")
+    expect(page.locator("#currentPlayer")).to_have_text("Player 6 (Brown)")
+    expect(page.locator("#phaseInfo")).to_have_text("Place 2nd settlement")
+
+    # Every vertex sits inside the fitted viewBox
+    x, y, width, height = map(float, page.locator("#board").get_attribute("viewBox").split())
+    vertices = page.evaluate("Array.from(TOPOLOGY.vertexX, (x, v) => [x, TOPOLOGY.vertexY[v]])")
+    assert all(x < vx < x + width and y < vy < y + height for vx, vy in vertices)
+
+
+def test_map_save_codes_stay_on_their_map(page: Page, static_server):
+    """Test that a base map code is refused on the extension map."""
+    page.goto("/catan-practice.html?seed=42")
+    code = page.evaluate("saveBoard()")
+    page.goto("/catan-practice.html?map=extension&seed=42")
+    assert page.evaluate("code => loadBoard(code)", code) is False
+    assert page.evaluate("loadBoard(saveBoard())") is True
+
+
+def test_code_param_starts_from_board_code(page: Page, static_server, click_hint):
+    """Test that ?code=CODE starts from the board and placements in a board code."""
+    page.goto("/catan-practice.html?seed=42")
+    click_hint(page, "vertex")
+    code = page.evaluate("saveBoard()")
+    page.goto(f"/catan-practice.html?code={code}")
+    assert page.evaluate("saveBoard()") == code
+    expect(page.locator("#board .settlement")).to_have_count(1)
+
+
+def test_modals_added_on_first_open(practice_page: Page):
+    """Test that the load modal is added to the page when first opened, and reused."""
+    practice_page.evaluate("document.getElementById('loadModal')?.remove()")
+    expect(practice_page.locator("#loadModal")).to_have_count(0)
+    practice_page.locator("#loadBtn").click()
+    expect(practice_page.locator("#loadModal")).to_be_visible()
+    practice_page.locator("#loadModal").click(position={"x": 5, "y": 5})
+    expect(practice_page.locator("#loadModal")).to_be_hidden()
+    practice_page.locator("#loadBtn").click()
+    expect(practice_page.locator("#loadModal")).to_have_count(1)
+    practice_page.locator("#loadCancel").click()
+    expect(practice_page.locator("#loadModal")).to_be_hidden()
+
+
+def test_service_worker_serves_pages_offline(browser, static_server):
+    """Test that pages cached by sw.js load without the network."""
+    context = browser.new_context(base_url=static_server, service_workers="allow")
+    page = context.new_page()
+    page.goto("/catan-practice.html")
+    page.evaluate("navigator.serviceWorker.ready")
+    page.goto("/index.html")
+
+    context.set_offline(True)
+    page.goto("/catan-practice.html?seed=42")
+    expect(page.locator("#board .hex")).to_have_count(19)
+    page.goto("/index.html")
+    expect(page.locator("#tools-list a")).to_have_count(1)
+    context.close()
@@ -0,0 +1,75 @@
+import random
+
+import numpy as np
+import pytest
+from playwright.sync_api import Page, expect
+
+from tools.catan import Game, generate_board, load_board
+from tools.catan.rng import Mulberry32
+from tools.catan.simulate import income_table, simulate_income, starting_hands
+
+# Chance of each dice total
+DICE = np.array([0, 0] + [min(total - 1, 13 - total) / 36 for total in range(2, 13)])
+
+
+def drafted_game(seed):
+    """A board with a random complete draft."""
+    game = Game(generate_board(Mulberry32(seed)))
+    rng = random.Random(seed)
+    while game.phase != "done":
+        game.play(rng.choice(game.legal_moves()))
+    return game
+
+
+def expected_hands(game, turns):
+    """Exact mean hands after ``turns`` rolls."""
+    return starting_hands(game) + turns * np.tensordot(DICE, income_table(game), axes=1)
+
+
+def test_simulated_income_matches_expectation():
+    """Test that mean simulated hands match the exact expectation."""
+    game = drafted_game(42)
+    result = simulate_income(game, rolls=600_000, turns=12, seed=1)
+    assert result.trials == 50_000
+    assert result.mean() == pytest.approx(expected_hands(game, 12), abs=0.05)
+    assert result.distribution().sum(axis=2) == pytest.approx(np.ones((4, 5)))
+
+
+def test_build_probability_grows_with_turns():
+    """Test that the chance to afford an item never drops as rolls go on."""
+    result = simulate_income(drafted_game(7), rolls=120_000, turns=20, seed=2)
+    assert np.all(np.diff(result.build, axis=2) >= 0)
+    assert np.all(result.build_probability(5) <= result.build_probability())
+
+
+def test_simulation_is_reproducible():
+    """Test that a seed gives the same simulation."""
+    game = drafted_game(3)
+    a = simulate_income(game, rolls=12_000, seed=9)
+    b = simulate_income(game, rolls=12_000, seed=9)
+    assert np.array_equal(a.histogram, b.histogram)
+    assert np.array_equal(a.build, b.build)
+
+
+def test_page_income_simulation(practice_page: Page, click_hint):
+    """Test that the page's simulation agrees with the exact expectation."""
+    practice_page.evaluate("resetPractice(42)")
+    expect(practice_page.locator("#simulateBtn")).to_be_disabled()
+    for _ in range(8):
+        click_hint(practice_page, "vertex")
+        click_hint(practice_page, "edge")
+
+    practice_page.locator("#simulateBtn").click()
+    expect(practice_page.locator("#incomeResults .income-table tr")).to_have_count(5)
+    means = practice_page.evaluate("""
+        () => {
+            const { trials, size, histogram } = incomeSimulation.result;
+            return [0, 1, 2, 3].map(p => [0, 1, 2, 3, 4].map(r => {
+                let sum = 0;
+                for (let count = 0; count < size; count++) sum += count * histogram[(p * 5 + r) * size + count];
+                return sum / trials;
+            }));
+        }
+    """)
+    game = load_board(practice_page.evaluate("saveBoard()"))
+    assert np.array(means) == pytest.approx(expected_hands(game, 12), abs=0.05)
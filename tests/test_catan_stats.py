@@ -0,0 +1,112 @@
+import csv
+import json
+
+from tools.catan import HEX_POSITIONS, TOPOLOGY, generate_board, generate_board_counted
+from tools.catan.batch import generate_boards
+from tools.catan.boardfile import write_board_file
+from tools.catan.evaluate import evaluate_vertices
+from tools.catan.rng import Mulberry32
+from tools.catan.stats import board_stats, corpus_chunks, engine_chunks, generated_chunks, main
+
+
+def test_generate_board_counted():
+    """Test that the counted generator gives generate_board()'s board and the page's counts."""
+    board, attempts = generate_board_counted(Mulberry32(42))
+    assert board == generate_board(Mulberry32(42))
+    assert attempts >= 1
+
+
+def test_stats_match_per_board_counts():
+    """Test that the vectorized histograms agree with counting board by board."""
+    stats = board_stats(engine_chunks(60, seed=5, chunk_size=25))
+    boards = [generate_board(Mulberry32(5 + k)) for k in range(60)]
+    assert stats.boards == 60
+    assert sum(stats.attempts["layouts"]) == 60
+
+    max_pips = [0] * len(stats.max_vertex_pips)
+    spacing = [0] * len(stats.red_spacing)
+    port_resources = {}
+    for board in boards:
+        pips = [score.pips for score in evaluate_vertices(board)]
+        max_pips[max(pips)] += 1
+        for v, p in enumerate(pips):
+            stats.vertex_pips[v, p] -= 1
+
+        reds = [HEX_POSITIONS[h] for h, n in enumerate(board.numbers) if n in (6, 8)]
+        spacing[min(
+            (abs(q1 - q2) + abs(r1 - r2) + abs(q1 + r1 - q2 - r2)) // 2
+            for i, (q1, r1) in enumerate(reds) for q2, r2 in reds[i + 1:]
+        )] += 1
+
+        for kind, v1, v2 in board.ports():
+            for h in set(TOPOLOGY.vertex_hexes[v1]) | set(TOPOLOGY.vertex_hexes[v2]):
+                key = (kind, board.resources[h])
+                port_resources[key] = port_resources.get(key, 0) + 1
+
+    assert stats.max_vertex_pips.tolist() == max_pips
+    assert not stats.vertex_pips.any()
+    assert stats.red_spacing.tolist() == spacing
+    assert sum(stats.red_pair_distances) == 60 * 6  # Four red tokens, six pairs
+    result = stats.to_dict()["port_resources"]
+    assert {(k, r): c for k, row in result.items() for r, c in row.items() if c} == port_resources
+
+
+def chi_square(observed, reference):
+    """Chi-square of ``observed`` counts against the proportions of ``reference``."""
+    expected = [count * sum(observed) / sum(reference) for count in reference]
+    return sum((o - e) ** 2 / e for o, e in zip(observed, expected))
+
+
+def test_engine_matches_batch_distribution():
+    """Test that the page's generator and the batch rejection sampler give the same board distribution."""
+    engine = board_stats(engine_chunks(5000, seed=1))
+    batch = board_stats(generated_chunks(100_000, seed=1, workers=1))
+
+    # Richest vertex 11 or less vs 12, and distances between 6/8 pairs
+    def max_pips(stats):
+        return [stats.max_vertex_pips[:12].sum(), stats.max_vertex_pips[12]]
+
+    assert chi_square(max_pips(engine), max_pips(batch)) < 12
+    assert chi_square(engine.red_pair_distances[2:], batch.red_pair_distances[2:]) < 15
+
+
+def test_stats_independent_of_chunk_size(tmp_path):
+    """Test that a corpus gives the same statistics however it is chunked."""
+    path = tmp_path / "boards.bin"
+    write_board_file(path, generate_boards(1000, seed=3))
+    whole = board_stats(corpus_chunks(path)).to_dict()
+    chunked = board_stats(corpus_chunks(path, chunk_size=7)).to_dict()
+    assert whole == chunked
+    assert whole["boards"] == 1000
+
+
+def test_generate_boards_counts_attempts():
+    """Test that batch boards record how many candidates each one took."""
+    batch = generate_boards(3000, seed=2, chunk_size=1000)
+    assert len(batch.attempts) == 3000
+    assert batch.attempts.min() >= 1
+    assert (generate_boards(3000, seed=2, chunk_size=1000).attempts == batch.attempts).all()
+
+
+def test_cli_json_and_csv(tmp_path):
+    """Test that catan-stats writes JSON and CSV for a corpus and for the generator."""
+    path = tmp_path / "boards.bin"
+    write_board_file(path, generate_boards(500, seed=4))
+
+    main(["corpus", str(path), "-o", str(tmp_path / "stats.json")])
+    result = json.loads((tmp_path / "stats.json").read_text())
+    assert result["source"] == {"kind": "corpus", "path": str(path)}
+    assert result["boards"] == 500 == sum(result["max_vertex_pips"])
+    assert len(result["vertex_pips"]) == TOPOLOGY.vertex_count
+
+    main(["corpus", str(path), "--format", "csv", "-o", str(tmp_path / "stats.csv")])
+    with open(tmp_path / "stats.csv", newline="") as f:
+        rows = list(csv.DictReader(f))
+    assert sum(int(row["count"]) for row in rows if row["statistic"] == "max_vertex_pips") == 500
+    vertex_0 = [row for row in rows if row["statistic"] == "vertex_pips" and row["group"] == "0"]
+    assert sum(int(row["count"]) for row in vertex_0) == 500
+
+    main(["generate", "2000", "--seed", "1", "--workers", "1", "--chunk-size", "1000",
+          "-o", str(tmp_path / "gen.json")])
+    result = json.loads((tmp_path / "gen.json").read_text())
+    assert result["boards"] == 2000 == sum(result["attempts"]["candidates"])
@@ -0,0 +1,49 @@
+import pathlib
+import urllib.error
+import urllib.request
+
+import pytest
+
+CORPUS = pathlib.Path(__file__).parent.parent / "catan-boards.bin"
+
+
+def fetch(url, range_header=None):
+    """``(status, headers, body)`` for a GET of ``url``, with an optional Range header."""
+    request = urllib.request.Request(url, headers={"Range": range_header} if range_header else {})
+    try:
+        with urllib.request.urlopen(request) as response:
+            return response.status, response.headers, response.read()
+    except urllib.error.HTTPError as error:
+        return error.code, error.headers, error.read()
+
+
+@pytest.mark.parametrize("range_header, start, end", [
+    ("bytes=32-51", 32, 51),
+    ("bytes=100-", 100, None),
+    ("bytes=-20", -20, None),
+])
+def test_range_request_gets_partial_content(static_server, range_header, start, end):
+    """Test that a single byte range is answered with 206 and just those bytes."""
+    data = CORPUS.read_bytes()
+    expected = data[start:None if end is None else end + 1]
+    status, headers, body = fetch(f"{static_server}/catan-boards.bin", range_header)
+    assert status == 206
+    assert body == expected
+    first = start % len(data)
+    assert headers["Content-Range"] == f"bytes {first}-{first + len(expected) - 1}/{len(data)}"
+
+
+def test_range_past_end_not_satisfiable(static_server):
+    """Test that a range starting past the end of the file gets 416."""
+    size = CORPUS.stat().st_size
+    status, headers, _ = fetch(f"{static_server}/catan-boards.bin", f"bytes={size}-")
+    assert status == 416
+    assert headers["Content-Range"] == f"bytes */{size}"
+
+
+@pytest.mark.parametrize("range_header", [None, "bytes=0-1,4-5", "bytes=9-3", "items=0-1"])
+def test_other_requests_get_whole_file(static_server, range_header):
+    """Test that requests without a single usable range get the whole file."""
+    status, _, body = fetch(f"{static_server}/catan-boards.bin", range_header)
+    assert status == 200
+    assert body == CORPUS.read_bytes()
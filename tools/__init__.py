@@ -0,0 +1 @@
+"""Python counterparts of the browser-based tools in this repository."""
@@ -0,0 +1,72 @@
+"""Headless engine for the Catan placement practice tool.
+
+Implements the same rules as catan-practice.html (board generation and
+validation, ports, the snake draft, legal moves and the save format) so
+boards can be generated and analysed without a browser, on the base map or
+any other BoardMap.
+"""
+from .board import (
+    BASE_MAP,
+    EXTENSION_MAP,
+    HEX_POSITIONS,
+    MAPS,
+    NUMBER_PROBABILITY,
+    NUMBER_TOKENS,
+    PLACEMENT_ORDER,
+    PORT_EDGE_POSITIONS,
+    PORT_KINDS,
+    PORT_TYPES,
+    PORT_VERTICES,
+    RESOURCE_COUNTS,
+    RESOURCES,
+    TOPOLOGY,
+    Board,
+    BoardMap,
+    Topology,
+    build_topology,
+)
+from .game import Action, Game
+from .generate import (
+    BoardGenerationError,
+    generate_board,
+    generate_board_counted,
+    generate_port_types,
+    is_valid_board,
+    shuffle,
+)
+from .rng import Mulberry32, random_seed
+from .save import load_board, save_board, save_board_legacy
+
+__all__ = [
+    "BASE_MAP",
+    "EXTENSION_MAP",
+    "HEX_POSITIONS",
+    "MAPS",
+    "NUMBER_PROBABILITY",
+    "NUMBER_TOKENS",
+    "PLACEMENT_ORDER",
+    "PORT_EDGE_POSITIONS",
+    "PORT_KINDS",
+    "PORT_TYPES",
+    "PORT_VERTICES",
+    "RESOURCE_COUNTS",
+    "RESOURCES",
+    "TOPOLOGY",
+    "Action",
+    "Board",
+    "BoardGenerationError",
+    "BoardMap",
+    "Game",
+    "Mulberry32",
+    "Topology",
+    "build_topology",
+    "generate_board",
+    "generate_board_counted",
+    "generate_port_types",
+    "is_valid_board",
+    "load_board",
+    "random_seed",
+    "save_board",
+    "save_board_legacy",
+    "shuffle",
+]
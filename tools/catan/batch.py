@@ -0,0 +1,212 @@
+"""Vectorized batch board generation and validation with NumPy.
+
+Boards are dense integer arrays, one row per board:
+
+- ``resources`` (N x 19): index into RESOURCES, so the desert is 5
+- ``numbers`` (N x 19): number token, 0 on the desert
+- ``ports`` (N x 9): index into PORT_KINDS, one per PORT_EDGE_POSITIONS entry
+
+Validation applies the three ``isValidBoard`` rules to a whole batch through
+the hex adjacency matrix and the vertex -> hex incidence matrix, with no
+per-board Python loop. Generation is rejection sampling over these arrays,
+so boards are uniform over all valid layouts, the same distribution as the
+page's generator (``assignNumbers()``, ``generate.assign_numbers()``).
+"""
+import functools
+import itertools
+from dataclasses import dataclass
+
+import numpy as np
+
+from .board import (
+    NUMBER_PROBABILITY,
+    NUMBER_TOKENS,
+    PORT_KINDS,
+    PORT_TYPES,
+    RESOURCE_COUNTS,
+    RESOURCES,
+    TOPOLOGY,
+    Board,
+)
+
+DESERT = RESOURCES.index("desert")
+
+# hex x hex, 1 where two hexes share an edge
+HEX_ADJACENCY = np.zeros((TOPOLOGY.hex_count, TOPOLOGY.hex_count), dtype=np.int8)
+for _i, _neighbors in enumerate(TOPOLOGY.hex_neighbors):
+    HEX_ADJACENCY[_i, list(_neighbors)] = 1
+
+# vertex x hex, 1 where the hex touches the vertex
+VERTEX_HEX_INCIDENCE = np.zeros((TOPOLOGY.vertex_count, TOPOLOGY.hex_count), dtype=np.int8)
+for _v, _hexes in enumerate(TOPOLOGY.vertex_hexes):
+    VERTEX_HEX_INCIDENCE[_v, list(_hexes)] = 1
+
+# float32 copies: matrix products on floats go through BLAS
+_ADJACENCY_F = HEX_ADJACENCY.astype(np.float32)
+_INCIDENCE_T = VERTEX_HEX_INCIDENCE.T.astype(np.float32)
+
+# Each adjacent hex pair once, as two index arrays
+_PAIR_A, _PAIR_B = np.nonzero(np.triu(HEX_ADJACENCY))
+
+# Pips by token value (index 0 is the desert)
+PIPS = np.zeros(13, dtype=np.int8)
+for _number, _pips in NUMBER_PROBABILITY.items():
+    PIPS[_number] = _pips
+
+_RED_TOKENS = np.array(sorted(n for n in NUMBER_TOKENS if n in (6, 8)), dtype=np.int8)
+_OTHER_TOKENS = np.array(sorted(n for n in NUMBER_TOKENS if n not in (6, 8)), dtype=np.int8)
+_NON_DESERT = np.array(
+    [RESOURCES.index(r) for r, count in RESOURCE_COUNTS.items() for _ in range(count) if r != "desert"],
+    dtype=np.int8,
+)
+_PORT_CODES = np.array([PORT_KINDS.index(t) for t in PORT_TYPES], dtype=np.int8)
+
+
+@dataclass
+class BoardBatch:
+    """N boards as dense integer arrays.
+
+    ``attempts``, set by ``generate_boards()``, counts the candidate layouts
+    drawn for each board, the accepted one included.
+    """
+
+    resources: np.ndarray
+    numbers: np.ndarray
+    ports: np.ndarray
+    attempts: np.ndarray | None = None
+
+    def __len__(self):
+        return len(self.numbers)
+
+    def board(self, k):
+        """Return board ``k`` as a Board."""
+        return Board(
+            tuple(RESOURCES[r] for r in self.resources[k]),
+            tuple(int(n) if n else None for n in self.numbers[k]),
+            tuple(PORT_KINDS[p] for p in self.ports[k]),
+        )
+
+    @classmethod
+    def from_boards(cls, boards):
+        """Pack a sequence of Board records into arrays."""
+        return cls(
+            np.array([[RESOURCES.index(r) for r in b.resources] for b in boards], dtype=np.int8).reshape(-1, 19),
+            np.array([[n or 0 for n in b.numbers] for b in boards], dtype=np.int8).reshape(-1, 19),
+            np.array([[PORT_KINDS.index(p) for p in b.port_types] for b in boards], dtype=np.int8).reshape(-1, 9),
+        )
+
+
+def vertex_pips(numbers):
+    """Total pips at each vertex: (N x 19) numbers -> (N x 54) pips."""
+    return PIPS[numbers].astype(np.float32) @ _INCIDENCE_T
+
+
+def _reds_touch(numbers):
+    red = ((numbers == 6) | (numbers == 8)).astype(np.float32)
+    return ((red @ _ADJACENCY_F) * red).any(axis=1)
+
+
+def _same_numbers_touch(numbers):
+    a = numbers[:, _PAIR_A]
+    return ((a == numbers[:, _PAIR_B]) & (a != 0)).any(axis=1)
+
+
+def _too_many_pips(numbers):
+    return (vertex_pips(numbers) >= 13).any(axis=1)
+
+
+def validate_boards(numbers):
+    """Apply the three board rules to an (N x 19) numbers array.
+
+    Returns a boolean array, True where the board is valid.
+    """
+    numbers = np.asarray(numbers)
+    return ~(_reds_touch(numbers) | _same_numbers_touch(numbers) | _too_many_pips(numbers))
+
+
+def _shuffled_rows(rng, values, n):
+    """n independent random permutations of ``values``, one per row."""
+    order = np.argsort(rng.random((n, len(values))), axis=1)
+    return values[order]
+
+
+@functools.cache
+def _red_layouts():
+    """Every (desert hex, four 6/8 hexes) choice whose red hexes don't touch.
+
+    Returns ``(red, other)``: for each layout, the four red hexes and the
+    fourteen hexes left for the other tokens, as (L x 4) and (L x 14) arrays.
+    """
+    hex_count = TOPOLOGY.hex_count
+    reds = np.array(list(itertools.combinations(range(hex_count), 4)), dtype=np.intp)
+    touching = HEX_ADJACENCY[reds[:, :, None], reds[:, None, :]].any(axis=(1, 2))
+    reds = reds[~touching]
+
+    # Pair every red set with each desert hex outside it
+    deserts = np.tile(np.arange(hex_count), len(reds))
+    reds = np.repeat(reds, hex_count, axis=0)
+    keep = (reds != deserts[:, None]).all(axis=1)
+    reds, deserts = reds[keep], deserts[keep]
+
+    used = np.zeros((len(reds), hex_count), dtype=bool)
+    used[np.arange(len(reds))[:, None], reds] = True
+    used[np.arange(len(reds)), deserts] = True
+    other = np.nonzero(~used)[1].reshape(len(reds), -1)
+    return reds, other
+
+
+def _candidate_numbers(rng, n):
+    """n random token layouts that already satisfy the 6/8 rule.
+
+    Every red layout has the same number of completions, so drawing one
+    uniformly and then shuffling the remaining tokens is the same as
+    shuffling all tokens and keeping the layouts where 6s and 8s don't
+    touch. Returns the numbers and each row's non-desert hexes.
+    """
+    red, other = _red_layouts()
+    layout = rng.integers(0, len(red), n)
+    rows = np.arange(n)[:, None]
+
+    numbers = np.zeros((n, TOPOLOGY.hex_count), dtype=np.int8)
+    numbers[rows, red[layout]] = _shuffled_rows(rng, _RED_TOKENS, n)
+    numbers[rows, other[layout]] = _shuffled_rows(rng, _OTHER_TOKENS, n)
+    return numbers
+
+
+def generate_boards(n, seed=None, chunk_size=100_000):
+    """Generate ``n`` valid boards as a BoardBatch.
+
+    ``seed`` is anything ``numpy.random.default_rng`` accepts. Candidates
+    are drawn ``chunk_size`` at a time, so memory stays bounded.
+    """
+    rng = np.random.default_rng(seed)
+    accepted = []
+    attempts = []
+    found = 0
+    drawn = 0
+    last = -1  # Candidate number of the last accepted board
+
+    while found < n:
+        # Candidates already satisfy the 6/8 rule; the same-number rule
+        # rejects most of the rest and is cheap, so it runs first
+        numbers = _candidate_numbers(rng, chunk_size)
+        kept = np.flatnonzero(~_same_numbers_touch(numbers))
+        kept = kept[~_too_many_pips(numbers[kept])]
+        accepted.append(numbers[kept])
+        found += len(kept)
+
+        positions = drawn + kept
+        attempts.append(np.diff(positions, prepend=last))
+        if len(positions):
+            last = positions[-1]
+        drawn += chunk_size
+
+    numbers = np.concatenate(accepted)[:n]
+
+    # Resources don't affect validity, so only accepted boards get them
+    resources = np.full((n, TOPOLOGY.hex_count), DESERT, dtype=np.int8)
+    land = numbers != 0
+    resources[land] = _shuffled_rows(rng, _NON_DESERT, n).ravel()
+    ports = _shuffled_rows(rng, _PORT_CODES, n)
+
+    return BoardBatch(resources, numbers, ports, np.concatenate(attempts)[:n])
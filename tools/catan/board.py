@@ -0,0 +1,306 @@
+"""Board constants, maps, topology and the board record.
+
+Everything here mirrors the constants, ``BOARD_MAPS`` and ``buildTopology()``
+in catan-practice.html, including vertex and edge numbering and the string
+keys used by the page's save format. The module-level constants
+(HEX_POSITIONS, TOPOLOGY, PLACEMENT_ORDER, ...) are those of the base map.
+"""
+import math
+from dataclasses import dataclass, field
+from functools import cached_property
+
+HEX_SIZE = 50
+BOARD_CENTER_X = 290
+BOARD_CENTER_Y = 270
+
+RESOURCES = ("forest", "field", "pasture", "hill", "mountain", "desert")
+
+NUMBER_PROBABILITY = {2: 1, 3: 2, 4: 3, 5: 4, 6: 5, 8: 5, 9: 4, 10: 3, 11: 2, 12: 1}
+
+# Distinct port types, in the order saves and batches number them
+PORT_KINDS = ("3:1", "wood", "wheat", "sheep", "brick", "ore")
+
+# Axial coordinate directions for adjacent hexes
+HEX_DIRECTIONS = ((1, 0), (-1, 0), (0, 1), (0, -1), (1, -1), (-1, 1))
+
+# Hex corners on an integer lattice (x in units of HEX_SIZE * sqrt(3) / 2,
+# y in units of HEX_SIZE / 2), in the same order as hex_corners()
+CORNER_LATTICE_OFFSETS = ((1, -1), (1, 1), (0, 2), (-1, 1), (-1, -1), (0, -2))
+
+# Largest vertex or edge count of a map: the page's move codes hold an index in 12 bits
+MAX_TOPOLOGY_SIZE = 4096
+
+
+def hex_to_pixel(q, r):
+    """Return the pixel centre of hex (q, r) on the page's SVG board."""
+    x = HEX_SIZE * (math.sqrt(3) * q + math.sqrt(3) / 2 * r) + BOARD_CENTER_X
+    y = HEX_SIZE * (3 / 2 * r) + BOARD_CENTER_Y
+    return x, y
+
+
+def hex_corners(cx, cy):
+    """Return the six pixel corners of the hex centred on (cx, cy)."""
+    corners = []
+    for i in range(6):
+        angle = math.pi / 180 * (60 * i - 30)
+        corners.append((cx + HEX_SIZE * math.cos(angle), cy + HEX_SIZE * math.sin(angle)))
+    return corners
+
+
+def round_coord(val):
+    """Round to one decimal the way the page's ``roundCoord()`` does."""
+    return math.floor(val * 10 + 0.5) / 10
+
+
+def _js_number(val):
+    """Format a float the way JavaScript's ``String(number)`` does."""
+    return str(int(val)) if val.is_integer() else repr(val)
+
+
+def vertex_key(x, y):
+    """Return the page's string key for the vertex at pixel (x, y)."""
+    return f"{_js_number(round_coord(x))},{_js_number(round_coord(y))}"
+
+
+def edge_key(x1, y1, x2, y2):
+    """Return the page's string key for the edge between two pixel points."""
+    k1 = vertex_key(x1, y1)
+    k2 = vertex_key(x2, y2)
+    return f"{k1}-{k2}" if k1 < k2 else f"{k2}-{k1}"
+
+
+@dataclass(frozen=True)
+class Topology:
+    """Integer-indexed adjacency tables for a hex layout."""
+
+    hex_count: int
+    vertex_count: int
+    edge_count: int
+    hex_centers: tuple
+    hex_neighbors: tuple
+    hex_vertices: tuple
+    hex_edges: tuple
+    vertex_points: tuple
+    vertex_hexes: tuple
+    vertex_neighbors: tuple
+    vertex_edges: tuple
+    edge_vertices: tuple
+    vertex_keys: tuple
+    edge_keys: tuple
+
+
+def build_topology(positions):
+    """Build the adjacency tables for a list of axial hex positions.
+
+    Vertices and edges are numbered in the order they are first met walking
+    the hexes and their corners, exactly as the page numbers them. Raises
+    ValueError for layouts with more than MAX_TOPOLOGY_SIZE vertices or
+    edges, which the page's move codes can't index.
+    """
+    hex_index_by_coord = {pos: i for i, pos in enumerate(positions)}
+
+    hex_centers = []
+    hex_neighbors = []
+    hex_vertices = []
+    hex_edges = []
+    vertex_index_by_lattice = {}
+    vertex_points = []
+    vertex_hexes = []
+    edge_index_by_vertices = {}
+    edge_vertices = []
+
+    for hex_index, (q, r) in enumerate(positions):
+        center = hex_to_pixel(q, r)
+        hex_centers.append(center)
+        hex_neighbors.append(tuple(
+            hex_index_by_coord[(q + dq, r + dr)]
+            for dq, dr in HEX_DIRECTIONS
+            if (q + dq, r + dr) in hex_index_by_coord
+        ))
+
+        corners = hex_corners(*center)
+        lattice_x = 2 * q + r
+        lattice_y = 3 * r
+        vertices = []
+        for corner, (dx, dy) in zip(corners, CORNER_LATTICE_OFFSETS):
+            lattice = (lattice_x + dx, lattice_y + dy)
+            vertex_index = vertex_index_by_lattice.get(lattice)
+            if vertex_index is None:
+                vertex_index = len(vertex_points)
+                vertex_index_by_lattice[lattice] = vertex_index
+                vertex_points.append(corner)
+                vertex_hexes.append([])
+            vertex_hexes[vertex_index].append(hex_index)
+            vertices.append(vertex_index)
+        hex_vertices.append(tuple(vertices))
+
+        edges = []
+        for i in range(6):
+            v1, v2 = vertices[i], vertices[(i + 1) % 6]
+            pair = (min(v1, v2), max(v1, v2))
+            edge_index = edge_index_by_vertices.get(pair)
+            if edge_index is None:
+                edge_index = len(edge_vertices)
+                edge_index_by_vertices[pair] = edge_index
+                edge_vertices.append((v1, v2))
+            edges.append(edge_index)
+        hex_edges.append(tuple(edges))
+
+    vertex_neighbors = [[] for _ in vertex_points]
+    vertex_edges = [[] for _ in vertex_points]
+    for edge_index, (v1, v2) in enumerate(edge_vertices):
+        vertex_neighbors[v1].append(v2)
+        vertex_edges[v1].append(edge_index)
+        vertex_neighbors[v2].append(v1)
+        vertex_edges[v2].append(edge_index)
+
+    if max(len(vertex_points), len(edge_vertices)) > MAX_TOPOLOGY_SIZE:
+        raise ValueError(f"Maps may have at most {MAX_TOPOLOGY_SIZE} vertices and edges")
+
+    return Topology(
+        hex_count=len(positions),
+        vertex_count=len(vertex_points),
+        edge_count=len(edge_vertices),
+        hex_centers=tuple(hex_centers),
+        hex_neighbors=tuple(hex_neighbors),
+        hex_vertices=tuple(hex_vertices),
+        hex_edges=tuple(hex_edges),
+        vertex_points=tuple(vertex_points),
+        vertex_hexes=tuple(tuple(h) for h in vertex_hexes),
+        vertex_neighbors=tuple(tuple(n) for n in vertex_neighbors),
+        vertex_edges=tuple(tuple(e) for e in vertex_edges),
+        edge_vertices=tuple(edge_vertices),
+        vertex_keys=tuple(vertex_key(x, y) for x, y in vertex_points),
+        edge_keys=tuple(
+            edge_key(*vertex_points[v1], *vertex_points[v2]) for v1, v2 in edge_vertices
+        ),
+    )
+
+
+def snake_draft_order(players):
+    """Snake draft: players 1 to ``players`` place, then ``players`` to 1."""
+    order = tuple(range(1, players + 1))
+    return order + order[::-1]
+
+
+@dataclass(frozen=True, eq=False)
+class BoardMap:
+    """A map: its hexes, resource and number token mix, ports and players.
+
+    ``port_edge_positions`` are ``(hex index, edge index)`` pairs, where edge
+    i runs from corner i to i + 1; ``port_types`` are shuffled onto them.
+    ``id`` identifies the map in version 2 save codes.
+    """
+
+    id: int
+    name: str
+    hex_positions: tuple
+    resource_counts: dict
+    number_tokens: tuple
+    port_edge_positions: tuple
+    port_types: tuple
+    players: int
+
+    @cached_property
+    def topology(self):
+        """Adjacency tables for the map's hexes, built on first use."""
+        return build_topology(self.hex_positions)
+
+    @cached_property
+    def port_vertices(self):
+        """The two vertices of each port edge."""
+        hex_vertices = self.topology.hex_vertices
+        return tuple(
+            (hex_vertices[hex_index][edge_index], hex_vertices[hex_index][(edge_index + 1) % 6])
+            for hex_index, edge_index in self.port_edge_positions
+        )
+
+    @cached_property
+    def placement_order(self):
+        """Player for each pick of the snake draft."""
+        return snake_draft_order(self.players)
+
+
+# Standard Catan board
+BASE_MAP = BoardMap(
+    id=0,
+    name="base",
+    hex_positions=(
+        (0, -2), (1, -2), (2, -2),
+        (-1, -1), (0, -1), (1, -1), (2, -1),
+        (-2, 0), (-1, 0), (0, 0), (1, 0), (2, 0),
+        (-2, 1), (-1, 1), (0, 1), (1, 1),
+        (-2, 2), (-1, 2), (0, 2),
+    ),
+    resource_counts={"forest": 4, "field": 4, "pasture": 4, "hill": 3, "mountain": 3, "desert": 1},
+    number_tokens=(5, 2, 6, 3, 8, 10, 9, 12, 11, 4, 8, 10, 9, 4, 5, 6, 3, 11),
+    port_edge_positions=((0, 5), (2, 5), (6, 0), (11, 1), (18, 0), (17, 2), (16, 3), (7, 3), (3, 4)),
+    port_types=("3:1", "3:1", "3:1", "3:1", "wood", "wheat", "sheep", "brick", "ore"),
+    players=4,
+)
+
+# 5-6 player extension: rows of 3-4-5-6-5-4-3 hexes
+EXTENSION_MAP = BoardMap(
+    id=1,
+    name="extension",
+    hex_positions=(
+        (0, -3), (1, -3), (2, -3),
+        (-1, -2), (0, -2), (1, -2), (2, -2),
+        (-2, -1), (-1, -1), (0, -1), (1, -1), (2, -1),
+        (-3, 0), (-2, 0), (-1, 0), (0, 0), (1, 0), (2, 0),
+        (-3, 1), (-2, 1), (-1, 1), (0, 1), (1, 1),
+        (-3, 2), (-2, 2), (-1, 2), (0, 2),
+        (-3, 3), (-2, 3), (-1, 3),
+    ),
+    resource_counts={"forest": 6, "field": 6, "pasture": 6, "hill": 5, "mountain": 5, "desert": 2},
+    number_tokens=(
+        2, 2, 3, 3, 3, 4, 4, 4, 5, 5, 5, 6, 6, 6,
+        8, 8, 8, 9, 9, 9, 10, 10, 10, 11, 11, 11, 12, 12,
+    ),
+    port_edge_positions=(
+        (1, 4), (2, 5), (11, 5), (17, 0), (26, 0), (29, 1), (27, 1), (23, 2), (12, 2), (7, 3), (3, 4),
+    ),
+    port_types=("3:1", "3:1", "3:1", "3:1", "3:1", "wood", "wheat", "sheep", "sheep", "brick", "ore"),
+    players=6,
+)
+
+# Maps by the name the page's ?map= takes
+MAPS = {board_map.name: board_map for board_map in (BASE_MAP, EXTENSION_MAP)}
+
+# The base map's tables, built once at import
+HEX_POSITIONS = BASE_MAP.hex_positions
+RESOURCE_COUNTS = BASE_MAP.resource_counts
+NUMBER_TOKENS = BASE_MAP.number_tokens
+PORT_EDGE_POSITIONS = BASE_MAP.port_edge_positions
+PORT_TYPES = BASE_MAP.port_types
+PLACEMENT_ORDER = BASE_MAP.placement_order
+TOPOLOGY = BASE_MAP.topology
+PORT_VERTICES = BASE_MAP.port_vertices
+
+
+@dataclass(frozen=True)
+class Board:
+    """A generated board: per-hex resources and numbers plus port types."""
+
+    resources: tuple
+    numbers: tuple
+    port_types: tuple
+    board_map: BoardMap = field(default=BASE_MAP, repr=False)
+
+    @property
+    def robber_hex(self):
+        """Index of the (first) desert hex, where the robber starts."""
+        return self.resources.index("desert")
+
+    def ports(self):
+        """Return ``(type, vertex1, vertex2)`` for each port."""
+        port_vertices = self.board_map.port_vertices
+        return [(port_type, v1, v2) for port_type, (v1, v2) in zip(self.port_types, port_vertices)]
+
+    def vertex_ports(self):
+        """Return the port type at each vertex, or None."""
+        result = [None] * self.board_map.topology.vertex_count
+        for port_type, v1, v2 in self.ports():
+            result[v1] = port_type
+            result[v2] = port_type
+        return result
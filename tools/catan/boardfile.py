@@ -0,0 +1,177 @@
+"""Board corpus files: fixed-width records with memory-mapped random access.
+
+Layout (all integers little-endian):
+
+- header, 32 bytes: magic ``b"CATANBRD"``, format version (u16), record
+  size (u16), flags (u32), board count (u64), seed (u64)
+- records, ``RECORD_SIZE`` bytes per board: the resource, number and port
+  fields of a board code (see save.py), packed MSB-first into bytes
+- index, present when ``FLAG_INDEX`` is set: one u64 board number per
+  record, strictly ascending
+
+Without an index, board number k is record k. Board k is at a fixed offset,
+so it can be read straight from a memory map here, or with one HTTP Range
+request by catan-practice.html (``?board=k``).
+"""
+import struct
+
+import numpy as np
+
+from .batch import DESERT, BoardBatch
+
+MAGIC = b"CATANBRD"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIQQ")
+FLAG_INDEX = 1  # Board number index after the records
+FLAG_SEED = 2  # Header seed field is meaningful
+
+# resources 19 x 3 bits, numbers 18 x 4 bits (number - 2), ports 9 x 3 bits
+_FIELDS = ((19, 3), (18, 4), (9, 3))
+RECORD_BITS = sum(count * width for count, width in _FIELDS)
+RECORD_SIZE = -(-RECORD_BITS // 8)
+
+
+def _to_bits(values, width):
+    shifts = np.arange(width - 1, -1, -1, dtype=np.uint8)
+    return ((values.astype(np.uint8)[:, :, None] >> shifts) & 1).reshape(len(values), -1)
+
+
+def _from_bits(bits, width):
+    weights = 1 << np.arange(width - 1, -1, -1)
+    return (bits.reshape(len(bits), -1, width) @ weights).astype(np.int8)
+
+
+def encode_records(batch):
+    """Pack a BoardBatch into an (N x RECORD_SIZE) uint8 array of records."""
+    n = len(batch)
+    numbers = batch.numbers[batch.resources != DESERT].reshape(n, -1) - 2
+    bits = np.concatenate(
+        [_to_bits(batch.resources, 3), _to_bits(numbers, 4), _to_bits(batch.ports, 3)], axis=1
+    )
+    return np.packbits(bits, axis=1)
+
+
+def decode_records(records):
+    """Unpack an (N x RECORD_SIZE) array of records into a BoardBatch."""
+    records = np.asarray(records, dtype=np.uint8).reshape(-1, RECORD_SIZE)
+    bits = np.unpackbits(records, axis=1)
+    resources = _from_bits(bits[:, :57], 3)
+    numbers = np.zeros(resources.shape, dtype=np.int8)
+    numbers[resources != DESERT] = (_from_bits(bits[:, 57:129], 4) + 2).ravel()
+    return BoardBatch(resources, numbers, _from_bits(bits[:, 129:RECORD_BITS], 3))
+
+
+class BoardFileWriter:
+    """Stream boards into a corpus file.
+
+    Call ``write()`` with BoardBatch chunks as they are produced; the board
+    count is filled in on ``close()``. With ``indexed=True`` every write
+    also takes the chunk's board numbers, which must keep ascending.
+    """
+
+    def __init__(self, path, seed=None, indexed=False):
+        self.seed = seed
+        self.indexed = indexed
+        self.count = 0
+        self._ids = []
+        self._file = open(path, "wb")
+        self._write_header()
+
+    def _write_header(self):
+        flags = (FLAG_INDEX if self.indexed else 0) | (FLAG_SEED if self.seed is not None else 0)
+        self._file.seek(0)
+        self._file.write(
+            HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, flags, self.count, self.seed or 0)
+        )
+
+    def write(self, batch, ids=None):
+        if self.indexed:
+            if ids is None or len(ids) != len(batch):
+                raise ValueError("an indexed corpus needs one board number per board")
+            ids = np.asarray(ids, dtype=np.uint64)
+            last = self._ids[-1][-1:] if self._ids else ids[:0]
+            if np.any(np.diff(np.concatenate([last, ids]).astype(np.int64)) <= 0):
+                raise ValueError("board numbers must be strictly ascending")
+            self._ids.append(ids)
+        elif ids is not None:
+            raise ValueError("board numbers given for a corpus without an index")
+        self._file.write(encode_records(batch).tobytes())
+        self.count += len(batch)
+
+    def close(self):
+        if self._file.closed:
+            return
+        for ids in self._ids:
+            self._file.write(ids.astype("<u8").tobytes())
+        self._write_header()
+        self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def write_board_file(path, batch, seed=None, ids=None):
+    """Write one BoardBatch as a corpus file (indexed when ``ids`` is given)."""
+    with BoardFileWriter(path, seed=seed, indexed=ids is not None) as writer:
+        writer.write(batch, ids)
+
+
+class BoardFile:
+    """Read-only view of a corpus file.
+
+    Records and the index are memory-mapped, so opening is O(1) and
+    ``board(k)`` touches only record k.
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            f.seek(0, 2)
+            size = f.tell()
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not a board corpus")
+        magic, version, record_size, flags, count, seed = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} board corpus")
+        indexed = bool(flags & FLAG_INDEX)
+        if size < HEADER.size + count * (RECORD_SIZE + 8 * indexed):
+            raise ValueError(f"{path} is truncated")
+
+        self.path = path
+        self.seed = seed if flags & FLAG_SEED else None
+        self.records = self._map(np.uint8, HEADER.size, (count, RECORD_SIZE))
+        self.ids = self._map("<u8", HEADER.size + count * RECORD_SIZE, (count,)) if indexed else None
+
+    def _map(self, dtype, offset, shape):
+        if shape[0] == 0:
+            return np.zeros(shape, dtype=dtype)
+        return np.memmap(self.path, dtype=dtype, mode="r", offset=offset, shape=shape)
+
+    def __len__(self):
+        return len(self.records)
+
+    def board_number(self, k):
+        """Board number of record ``k``."""
+        return k if self.ids is None else int(self.ids[k])
+
+    def find(self, number):
+        """Record holding board ``number``; raises KeyError if there is none."""
+        if self.ids is None:
+            if 0 <= number < len(self):
+                return number
+        else:
+            k = int(np.searchsorted(self.ids, np.uint64(number)))
+            if k < len(self) and self.ids[k] == number:
+                return k
+        raise KeyError(number)
+
+    def board(self, k):
+        """Record ``k`` as a Board."""
+        return decode_records(self.records[k]).board(0)
+
+    def batch(self, start=0, stop=None):
+        """Records ``start:stop`` as a BoardBatch."""
+        return decode_records(self.records[start:stop])
@@ -0,0 +1,248 @@
+"""Opening book: stored best settlements for draft positions.
+
+An OpeningBook is a SQLite database with two tables:
+
+- ``boards``: one row per board, keyed by ``board_key()`` (see zobrist.py),
+  with the board's code and indexed feature columns for ``find_boards()``:
+  the vertex with the most pips (``top_vertex``, ``top_pips``) and the port
+  on it (``top_port``, NULL if none)
+- ``positions``: one row per settlement-phase position, keyed by
+  ``position_key()``, with the position's save code, the player to move and
+  the best settlement (vertex index) with its score
+
+Books hold base map positions only. Best moves are greedy: the legal settlement with the highest
+``evaluate_vertices()`` total. Keys are the page's position keys, so
+``export_book()`` writes the positions as a sorted key file that the page
+reads with a binary search over HTTP Range requests (``?book=URL``), and
+``BookFile`` reads from a memory map.
+
+Key file layout (all integers little-endian):
+
+- header, 32 bytes: magic ``b"CATANBOK"``, format version (u16), record
+  size (u16), flags (u32, unused), position count (u64), reserved (u64)
+- records, ``RECORD_SIZE`` bytes per position, ascending by key: key (u64),
+  score (f32), best vertex (u8), player (u8), two bytes of padding
+"""
+import sqlite3
+import struct
+from dataclasses import dataclass
+
+import numpy as np
+
+from .board import BASE_MAP, NUMBER_PROBABILITY, TOPOLOGY
+from .evaluate import evaluate_vertices
+from .game import Game
+from .save import save_board
+from .zobrist import board_key, position_key
+
+MAGIC = b"CATANBOK"
+FORMAT_VERSION = 1
+HEADER = struct.Struct("<8sHHIQQ")
+RECORD = np.dtype([("key", "<u8"), ("score", "<f4"), ("vertex", "u1"), ("player", "u1"), ("pad", "V2")])
+RECORD_SIZE = RECORD.itemsize
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS boards (
+    key INTEGER PRIMARY KEY,
+    code TEXT NOT NULL,
+    top_vertex INTEGER NOT NULL,
+    top_pips INTEGER NOT NULL,
+    top_port TEXT
+);
+CREATE INDEX IF NOT EXISTS boards_top ON boards (top_port, top_pips);
+CREATE INDEX IF NOT EXISTS boards_top_pips ON boards (top_pips);
+CREATE TABLE IF NOT EXISTS positions (
+    key INTEGER PRIMARY KEY,
+    board INTEGER NOT NULL REFERENCES boards (key),
+    code TEXT NOT NULL,
+    player INTEGER NOT NULL,
+    vertex INTEGER NOT NULL,
+    score REAL NOT NULL
+);
+CREATE INDEX IF NOT EXISTS positions_board ON positions (board);
+"""
+
+
+@dataclass(frozen=True)
+class BookMove:
+    """Stored analysis of one position: the best settlement for ``player``."""
+
+    player: int
+    vertex: int
+    score: float
+
+
+@dataclass(frozen=True)
+class BookBoard:
+    """One board row and its features."""
+
+    key: int
+    code: str
+    top_vertex: int
+    top_pips: int
+    top_port: str
+
+
+# SQLite integers are signed 64-bit, keys are unsigned
+def _to_sql(key):
+    return key - (1 << 64) if key >= 1 << 63 else key
+
+
+def _from_sql(value):
+    return value & 0xFFFFFFFFFFFFFFFF
+
+
+def board_features(board):
+    """``(top_vertex, top_pips, top_port)`` of ``board``; ties go to the lowest vertex."""
+    pips = [
+        sum(NUMBER_PROBABILITY[board.numbers[h]] for h in hexes if board.numbers[h] is not None)
+        for hexes in TOPOLOGY.vertex_hexes
+    ]
+    top = max(range(TOPOLOGY.vertex_count), key=lambda v: (pips[v], -v))
+    return top, pips[top], board.vertex_ports()[top]
+
+
+def best_settlement(game, scores=None):
+    """Greedy best move for ``game``: ``(vertex, score)`` of the top-scoring legal settlement.
+
+    ``scores`` are the board's ``evaluate_vertices()``, if already computed.
+    """
+    scores = scores or evaluate_vertices(game.board)
+    vertex = max(game.legal_settlements(), key=lambda v: (scores[v].total, -v))
+    return vertex, scores[vertex].total
+
+
+class OpeningBook:
+    """SQLite-backed opening book (``path`` may be ``":memory:"``)."""
+
+    def __init__(self, path):
+        self.conn = sqlite3.connect(path)
+        self.conn.executescript(_SCHEMA)
+
+    def add_positions(self, games):
+        """Analyse and store the current position of each of ``games``.
+
+        Positions outside the settlement phase are skipped; positions
+        already in the book are replaced. Everything is inserted in one
+        transaction. Returns the number of positions stored. Raises
+        ValueError for a position on another map than the base map.
+        """
+        boards = {}
+        positions = []
+        for game in games:
+            if game.board.board_map is not BASE_MAP:
+                raise ValueError(f"Opening books hold base map positions, not {game.board.board_map.name}")
+            if game.phase != "settlement":
+                continue
+            hashed = board_key(game.board)
+            if hashed not in boards:
+                boards[hashed] = (game.board, evaluate_vertices(game.board))
+            vertex, score = best_settlement(game, boards[hashed][1])
+            positions.append((
+                _to_sql(position_key(game, hashed)), _to_sql(hashed), save_board(game),
+                game.current_player, vertex, score,
+            ))
+
+        board_rows = [
+            (_to_sql(hashed), save_board(Game(board)), *board_features(board))
+            for hashed, (board, _) in boards.items()
+        ]
+        with self.conn:
+            self.conn.executemany("INSERT OR IGNORE INTO boards VALUES (?, ?, ?, ?, ?)", board_rows)
+            self.conn.executemany("INSERT OR REPLACE INTO positions VALUES (?, ?, ?, ?, ?, ?)", positions)
+        return len(positions)
+
+    def lookup(self, key):
+        """BookMove stored for position ``key``, or None."""
+        row = self.conn.execute(
+            "SELECT player, vertex, score FROM positions WHERE key = ?", (_to_sql(key),)
+        ).fetchone()
+        return BookMove(*row) if row else None
+
+    def position_code(self, key):
+        """Save code of position ``key``; raises KeyError if it isn't in the book."""
+        row = self.conn.execute("SELECT code FROM positions WHERE key = ?", (_to_sql(key),)).fetchone()
+        if row is None:
+            raise KeyError(key)
+        return row[0]
+
+    def find_boards(self, top_port=None, min_top_pips=None, limit=None):
+        """Boards whose top-pip vertex has port ``top_port`` and at least ``min_top_pips`` pips.
+
+        Criteria left as None are not applied. Boards come back in key order.
+        """
+        where, args = [], []
+        if top_port is not None:
+            where.append("top_port = ?")
+            args.append(top_port)
+        if min_top_pips is not None:
+            where.append("top_pips >= ?")
+            args.append(min_top_pips)
+        sql = "SELECT key, code, top_vertex, top_pips, top_port FROM boards"
+        if where:
+            sql += " WHERE " + " AND ".join(where)
+        sql += " ORDER BY key"
+        if limit is not None:
+            sql += " LIMIT ?"
+            args.append(limit)
+        return [BookBoard(_from_sql(key), *rest) for key, *rest in self.conn.execute(sql, args)]
+
+    def __len__(self):
+        return self.conn.execute("SELECT COUNT(*) FROM positions").fetchone()[0]
+
+    def close(self):
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def export_book(book, path):
+    """Write every position in ``book`` as a key file, sorted by key."""
+    rows = book.conn.execute("SELECT key, score, vertex, player FROM positions").fetchall()
+    records = np.zeros(len(rows), dtype=RECORD)
+    if rows:
+        keys, scores, vertices, players = zip(*rows)
+        records["key"] = [_from_sql(key) for key in keys]
+        records["score"] = scores
+        records["vertex"] = vertices
+        records["player"] = players
+        records.sort(order="key")
+    with open(path, "wb") as f:
+        f.write(HEADER.pack(MAGIC, FORMAT_VERSION, RECORD_SIZE, 0, len(records), 0))
+        f.write(records.tobytes())
+
+
+class BookFile:
+    """Read-only view of a key file; lookups are binary searches over a memory map."""
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            header = f.read(HEADER.size)
+            f.seek(0, 2)
+            size = f.tell()
+        if len(header) < HEADER.size:
+            raise ValueError(f"{path} is not an opening book")
+        magic, version, record_size, _, count, _ = HEADER.unpack(header)
+        if magic != MAGIC or version != FORMAT_VERSION or record_size != RECORD_SIZE:
+            raise ValueError(f"{path} is not a version {FORMAT_VERSION} opening book")
+        if size < HEADER.size + count * RECORD_SIZE:
+            raise ValueError(f"{path} is truncated")
+        if count:
+            self.records = np.memmap(path, dtype=RECORD, mode="r", offset=HEADER.size, shape=(count,))
+        else:
+            self.records = np.zeros(0, dtype=RECORD)
+
+    def __len__(self):
+        return len(self.records)
+
+    def lookup(self, key):
+        """BookMove stored for position ``key``, or None."""
+        k = int(np.searchsorted(self.records["key"], np.uint64(key)))
+        if k < len(self) and self.records["key"][k] == key:
+            record = self.records[k]
+            return BookMove(int(record["player"]), int(record["vertex"]), float(record["score"]))
+        return None
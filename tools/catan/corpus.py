@@ -0,0 +1,76 @@
+"""Parallel, reproducible board-corpus generation.
+
+A corpus is cut into fixed-size tasks. Task ``i`` draws from its own NumPy
+stream seeded by ``(seed, i)``, so the boards depend only on the seed and
+task size, never on how many worker processes ran the tasks. Results come
+back in task order, so output is byte-identical for the same seed.
+``write_corpus()`` streams them into a corpus file (see boardfile.py).
+"""
+import collections
+import multiprocessing
+import os
+
+import numpy as np
+
+from .batch import BoardBatch, generate_boards
+from .boardfile import BoardFileWriter
+
+DEFAULT_TASK_SIZE = 100_000
+MAX_TASKS_IN_FLIGHT = 2  # Per worker
+
+
+def task_seed(seed, task):
+    """Seed for the NumPy stream of one task."""
+    return np.random.SeedSequence([seed & 0xFFFFFFFF, task])
+
+
+def _run_task(args):
+    seed, task, size = args
+    return generate_boards(size, seed=task_seed(seed, task))
+
+
+def iter_corpus(n, seed, workers=None, task_size=DEFAULT_TASK_SIZE):
+    """Yield ``n`` boards as BoardBatch chunks of up to ``task_size`` boards.
+
+    ``workers`` defaults to every core; with one worker the tasks run in
+    this process. At most MAX_TASKS_IN_FLIGHT tasks per worker are queued,
+    running or waiting to be taken, so memory stays bounded however large
+    ``n`` is and however slowly the chunks are consumed.
+    """
+    workers = workers or os.cpu_count() or 1
+    tasks = [(seed, task, min(task_size, n - start)) for task, start in enumerate(range(0, n, task_size))]
+
+    if workers == 1 or len(tasks) <= 1:
+        for args in tasks:
+            yield _run_task(args)
+        return
+
+    # Pool.imap would queue every task at once and buffer finished chunks
+    # for a slow consumer, so tasks are submitted only as results are taken
+    with multiprocessing.Pool(workers) as pool:
+        pending = collections.deque()
+        for args in tasks:
+            if len(pending) == MAX_TASKS_IN_FLIGHT * workers:
+                yield pending.popleft().get()
+            pending.append(pool.apply_async(_run_task, (args,)))
+        while pending:
+            yield pending.popleft().get()
+
+
+def generate_corpus(n, seed, workers=None, task_size=DEFAULT_TASK_SIZE):
+    """Generate ``n`` boards in parallel and return them as one BoardBatch."""
+    chunks = list(iter_corpus(n, seed, workers, task_size))
+    if not chunks:
+        return BoardBatch(*(np.zeros((0, width), dtype=np.int8) for width in (19, 19, 9)))
+    return BoardBatch(
+        np.concatenate([c.resources for c in chunks]),
+        np.concatenate([c.numbers for c in chunks]),
+        np.concatenate([c.ports for c in chunks]),
+    )
+
+
+def write_corpus(path, n, seed, workers=None, task_size=DEFAULT_TASK_SIZE):
+    """Generate ``n`` boards in parallel and stream them into a corpus file."""
+    with BoardFileWriter(path, seed=seed) as writer:
+        for chunk in iter_corpus(n, seed, workers, task_size):
+            writer.write(chunk)
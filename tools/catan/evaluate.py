@@ -0,0 +1,70 @@
+"""Per-vertex opening scores, the same as ``evaluateBoard()`` in the page.
+
+For each vertex:
+
+- ``pips``: sum of NUMBER_PROBABILITY over the adjacent hexes
+- ``diversity``: number of different resources produced
+- ``scarcity``: pips weighted per resource by mean production divided by
+  that resource's production on the board, so rare resources count for more
+- ``port``: PORT_GENERIC_VALUE for a 3:1 port, PORT_MATCH_WEIGHT per
+  adjacent pip of the resource a 2:1 port trades
+- ``total``: scarcity + DIVERSITY_WEIGHT * (diversity - 1) + port
+"""
+from dataclasses import dataclass
+
+from .board import NUMBER_PROBABILITY, RESOURCES
+
+PORT_RESOURCES = {"wood": "forest", "wheat": "field", "sheep": "pasture", "brick": "hill", "ore": "mountain"}
+DIVERSITY_WEIGHT = 1
+PORT_GENERIC_VALUE = 1
+PORT_MATCH_WEIGHT = 0.5
+
+
+@dataclass(frozen=True)
+class VertexScore:
+    """Score breakdown for one vertex."""
+
+    pips: int
+    diversity: int
+    scarcity: float
+    port: float
+    total: float
+
+
+def resource_production(board):
+    """Total pips per resource on ``board``."""
+    production = {resource: 0 for resource in RESOURCES if resource != "desert"}
+    for resource, number in zip(board.resources, board.numbers):
+        if number is not None:
+            production[resource] += NUMBER_PROBABILITY[number]
+    return production
+
+
+def evaluate_vertices(board):
+    """Return a VertexScore for every vertex of ``board``, by vertex index."""
+    production = resource_production(board)
+    mean = sum(production.values()) / len(production)
+    ports = board.vertex_ports()
+    topology = board.board_map.topology
+
+    scores = []
+    for v in range(topology.vertex_count):
+        produced = {}
+        scarcity = 0.0
+        for h in topology.vertex_hexes[v]:
+            number = board.numbers[h]
+            if number is None:
+                continue
+            pips = NUMBER_PROBABILITY[number]
+            produced[board.resources[h]] = produced.get(board.resources[h], 0) + pips
+            scarcity += pips * mean / production[board.resources[h]]
+
+        port = 0.0
+        if ports[v] is not None:
+            resource = PORT_RESOURCES.get(ports[v])
+            port = PORT_MATCH_WEIGHT * produced.get(resource, 0) if resource else PORT_GENERIC_VALUE
+
+        diversity = len(produced)
+        total = scarcity + DIVERSITY_WEIGHT * max(diversity - 1, 0) + port
+        scores.append(VertexScore(sum(produced.values()), diversity, scarcity, port, total))
+    return tuple(scores)
@@ -0,0 +1,110 @@
+"""Snake-draft placement game.
+
+Mirrors the placement logic in catan-practice.html: the snake draft order,
+the distance rule for settlements, roads attached to the settlement just
+placed, the optional skip-roads mode and undo. The topology and draft order
+come from the board's map.
+"""
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class Action:
+    """One history entry: a settlement (vertex index) or road (edge index)."""
+
+    type: str
+    index: int
+    player: int
+
+
+class Game:
+    """Placement state for one board."""
+
+    def __init__(self, board, skip_roads=False):
+        self.board = board
+        self.skip_roads = skip_roads
+        self.topology = board.board_map.topology
+        self.placement_order = board.board_map.placement_order
+        self.settlements = [0] * self.topology.vertex_count  # Player per vertex (0 = none)
+        self.roads = [0] * self.topology.edge_count  # Player per edge (0 = none)
+        self.blocked = [0] * self.topology.vertex_count  # Settlements on or next to each vertex
+        self.current_player = self.placement_order[0]
+        self.phase = "settlement"
+        self.round = 1
+        self.placement_index = 0
+        self.history = []
+
+    def _update_blocked(self, v, delta):
+        self.blocked[v] += delta
+        for neighbor in self.topology.vertex_neighbors[v]:
+            self.blocked[neighbor] += delta
+
+    def legal_settlements(self):
+        """Vertex indices where a settlement may go (distance rule only)."""
+        return [v for v in range(self.topology.vertex_count) if self.blocked[v] == 0]
+
+    def legal_roads(self):
+        """Edge indices touching the current player's most recent settlement."""
+        for action in reversed(self.history):
+            if action.type == "settlement" and action.player == self.current_player:
+                return [e for e in self.topology.vertex_edges[action.index] if not self.roads[e]]
+        return []
+
+    def legal_moves(self):
+        """Legal moves for the current phase as ``(type, index)`` pairs."""
+        if self.phase == "settlement":
+            return [("settlement", v) for v in self.legal_settlements()]
+        if self.phase == "road":
+            return [("road", e) for e in self.legal_roads()]
+        return []
+
+    def _advance_to_next_player(self):
+        self.placement_index += 1
+        if self.placement_index < len(self.placement_order):
+            self.current_player = self.placement_order[self.placement_index]
+            self.phase = "settlement"
+            if self.placement_index >= self.board.board_map.players:
+                self.round = 2
+        else:
+            self.phase = "done"
+
+    def place_settlement(self, v):
+        """Place the current player's settlement on vertex ``v``."""
+        self.settlements[v] = self.current_player
+        self._update_blocked(v, 1)
+        self.history.append(Action("settlement", v, self.current_player))
+        if self.skip_roads:
+            self._advance_to_next_player()
+        else:
+            self.phase = "road"
+
+    def place_road(self, e):
+        """Place the current player's road on edge ``e``."""
+        self.roads[e] = self.current_player
+        self.history.append(Action("road", e, self.current_player))
+        self._advance_to_next_player()
+
+    def play(self, move):
+        """Apply a ``(type, index)`` move as returned by legal_moves()."""
+        move_type, index = move
+        if move_type == "settlement":
+            self.place_settlement(index)
+        else:
+            self.place_road(index)
+
+    def undo(self):
+        """Take back the last action, if any."""
+        if not self.history:
+            return
+        action = self.history.pop()
+        if action.type == "settlement":
+            self.settlements[action.index] = 0
+            self._update_blocked(action.index, -1)
+        else:
+            self.roads[action.index] = 0
+        # The undone action was made on this pick (skip_roads or not)
+        picks = sum(a.type == "settlement" for a in self.history)
+        self.placement_index = picks if action.type == "settlement" else picks - 1
+        self.phase = action.type
+        self.current_player = action.player
+        self.round = 2 if self.placement_index >= self.board.board_map.players else 1
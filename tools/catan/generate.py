@@ -0,0 +1,133 @@
+"""Board generation and validation.
+
+Mirrors ``generateBoard()``, ``isValidBoard()`` and ``generatePorts()`` in
+catan-practice.html, consuming random numbers in the same order. Boards are
+generated for the base map unless a ``board_map`` (see board.py) is given.
+"""
+import math
+import random
+
+from .board import BASE_MAP, NUMBER_PROBABILITY, TOPOLOGY, Board
+
+MAX_ATTEMPTS = 100_000
+
+
+def _map_resources(board_map):
+    """One entry per hex of the map, in RESOURCE_COUNTS order."""
+    return tuple(
+        resource for resource, count in board_map.resource_counts.items() for _ in range(count)
+    )
+
+
+class BoardGenerationError(RuntimeError):
+    """Raised when no valid board is found within MAX_ATTEMPTS attempts."""
+
+
+def shuffle(items, rng=random.random):
+    """Return a shuffled copy of ``items`` (Fisher-Yates, as the page does)."""
+    arr = list(items)
+    for i in range(len(arr) - 1, 0, -1):
+        j = math.floor(rng() * (i + 1))
+        arr[i], arr[j] = arr[j], arr[i]
+    return arr
+
+
+def is_valid_board(numbers, topology=TOPOLOGY):
+    """Check per-hex numbers against the page's three board rules.
+
+    Adjacent hexes may not both be 6/8 or share a number, and no vertex may
+    total 13 or more pips. Desert hexes have number None.
+    """
+    for i, number in enumerate(numbers):
+        if number is None:
+            continue
+        for adj in topology.hex_neighbors[i]:
+            adj_number = numbers[adj]
+            if adj_number is None:
+                continue
+            if number in (6, 8) and adj_number in (6, 8):
+                return False
+            if number == adj_number:
+                return False
+
+    for hexes in topology.vertex_hexes:
+        pips = sum(NUMBER_PROBABILITY[numbers[h]] for h in hexes if numbers[h] is not None)
+        if pips >= 13:
+            return False
+
+    return True
+
+
+def _deal_order(board_map):
+    """The number tokens in the order ``assign_numbers()`` deals them.
+
+    The 6s and 8s come first, then the other tokens from most pips to
+    fewest, so a layout that breaks a rule tends to do so within a few draws.
+    """
+    tokens = board_map.number_tokens
+    reds = [n for n in tokens if n in (6, 8)]
+    others = sorted((n for n in tokens if n not in (6, 8)), key=lambda n: -NUMBER_PROBABILITY[n])
+    return tuple(reds + others)
+
+
+def assign_numbers(rng=random.random, max_attempts=MAX_ATTEMPTS, board_map=BASE_MAP):
+    """Deal the number tokens onto the hexes until a deal breaks no rule.
+
+    Each attempt deals the tokens onto uniformly random hexes and is
+    abandoned as soon as a token breaks one of ``is_valid_board()``'s rules
+    against the tokens already dealt. A finished deal is valid without
+    checking the whole board, and every valid layout is equally likely (as
+    with shuffling and checking whole boards; a backtracking search would
+    favour some layouts). The hexes left over are the deserts. Returns
+    ``(numbers, attempts)`` with None on the deserts, or
+    ``(None, attempts)`` if every attempt broke a rule.
+    """
+    topology = board_map.topology
+    deal = _deal_order(board_map)
+    order = list(range(topology.hex_count))
+    for attempt in range(1, max_attempts + 1):
+        numbers = [None] * topology.hex_count
+        vertex_pips = [0] * topology.vertex_count
+        for i, number in enumerate(deal):
+            # Forward Fisher-Yates: order[i] is a uniform pick from the hexes left
+            j = i + math.floor(rng() * (len(order) - i))
+            order[i], order[j] = order[j], order[i]
+            hex_index = order[i]
+            pips = NUMBER_PROBABILITY[number]
+            if any(
+                numbers[adj] == number or (number in (6, 8) and numbers[adj] in (6, 8))
+                for adj in topology.hex_neighbors[hex_index]
+            ) or any(vertex_pips[v] + pips >= 13 for v in topology.hex_vertices[hex_index]):
+                break
+            numbers[hex_index] = number
+            for v in topology.hex_vertices[hex_index]:
+                vertex_pips[v] += pips
+        else:
+            return numbers, attempt
+    return None, max_attempts
+
+
+def generate_port_types(rng=random.random, board_map=BASE_MAP):
+    """Shuffle the map's port types onto its fixed port positions."""
+    return tuple(shuffle(board_map.port_types, rng))
+
+
+def generate_board(rng=random.random, board_map=BASE_MAP):
+    """Generate a valid board for ``board_map``, or raise BoardGenerationError."""
+    return generate_board_counted(rng, board_map)[0]
+
+
+def generate_board_counted(rng=random.random, board_map=BASE_MAP):
+    """Like ``generate_board()``, but return ``(board, attempts)``.
+
+    ``attempts`` is the page's ``lastGeneration.attempts``: how many number
+    layouts were dealt, the valid one included.
+    """
+    numbers, attempts = assign_numbers(rng, board_map=board_map)
+    if numbers is None:
+        raise BoardGenerationError(f"Could not generate a valid board in {MAX_ATTEMPTS} attempts")
+
+    # Resources don't affect validity, so they go onto the land hexes afterwards
+    land = iter(shuffle([r for r in _map_resources(board_map) if r != "desert"], rng))
+    resources = tuple("desert" if number is None else next(land) for number in numbers)
+    return Board(resources, tuple(numbers), generate_port_types(rng, board_map), board_map), attempts
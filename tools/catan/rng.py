@@ -0,0 +1,32 @@
+"""Seedable PRNG shared with the page.
+
+``Mulberry32`` produces the same float sequence as ``mulberry32()`` in
+catan-practice.html, so ``generate_board(Mulberry32(seed))`` builds the same
+board as the page's ``generateBoard(seed)`` (and ``?seed=`` URLs).
+"""
+import random
+
+_MASK = 0xFFFFFFFF
+
+
+class Mulberry32:
+    """Callable returning floats in [0, 1), like ``Math.random``."""
+
+    def __init__(self, seed):
+        self.state = seed & _MASK
+
+    def next_uint32(self):
+        """Advance the generator and return the next 32-bit output."""
+        self.state = (self.state + 0x6D2B79F5) & _MASK
+        a = self.state
+        t = ((a ^ (a >> 15)) * (1 | a)) & _MASK
+        t = ((t + (((t ^ (t >> 7)) * (61 | t)) & _MASK)) & _MASK) ^ t
+        return (t ^ (t >> 14)) & _MASK
+
+    def __call__(self):
+        return self.next_uint32() / 4294967296
+
+
+def random_seed():
+    """A fresh 32-bit seed, as the page's ``randomSeed()`` picks one."""
+    return random.getrandbits(32)
@@ -0,0 +1,257 @@
+"""The page's save formats.
+
+``save_board()`` produces the same string as ``saveBoard()`` in
+catan-practice.html for the same position: fixed-width bit fields packed
+MSB-first into URL-safe base64 characters, with no padding. Fields, in order:
+
+- version, 6 bits
+- map, 4 bits (``BoardMap.id``), version 2 only
+- resource per hex, 3 bits (index into RESOURCES)
+- number per non-desert hex, 4 bits (number - 2)
+- port type per port, 3 bits (index into PORT_KINDS)
+- placement index 4 bits, phase 2 bits (index into PHASES), current player
+  2 bits (player - 1)
+- action count 5 bits, then per action in history order a type bit
+  (0 = settlement, 1 = road), the vertex or edge index in 7 bits and the
+  player in 2 bits (player - 1)
+
+Base map boards are version 1. Boards on other maps are version 2, which
+adds the map id and sizes the placement index, player, action count and
+index fields to the map (``_field_bits()``; on the base map they are the
+widths above).
+
+The robber starts on the desert, so it is not stored. ``load_board()`` also
+reads the older base64 JSON saves, which always start with ``eyJ``;
+``save_board_legacy()`` still writes them.
+"""
+import base64
+import binascii
+import json
+import random
+
+from .board import (
+    BASE_MAP,
+    MAPS,
+    NUMBER_PROBABILITY,
+    PLACEMENT_ORDER,
+    PORT_EDGE_POSITIONS,
+    PORT_KINDS,
+    RESOURCES,
+    TOPOLOGY,
+    Board,
+)
+from .game import Action, Game
+from .generate import generate_port_types
+
+SAVE_FORMAT_VERSION = 1
+MAP_SAVE_FORMAT_VERSION = 2
+CODE_ALPHABET = "ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789-_"
+PHASES = ("settlement", "road", "done")
+
+_DIGITS = {c: i for i, c in enumerate(CODE_ALPHABET)}
+_VERTEX_INDEX = {key: i for i, key in enumerate(TOPOLOGY.vertex_keys)}
+_EDGE_INDEX = {key: i for i, key in enumerate(TOPOLOGY.edge_keys)}
+_MAPS_BY_ID = {board_map.id: board_map for board_map in MAPS.values()}
+
+
+def _field_bits(board_map):
+    """Widths of the placement index, player, action count and index fields."""
+    topology = board_map.topology
+    return (
+        (board_map.players * 2).bit_length(),
+        max(1, (board_map.players - 1).bit_length()),
+        (board_map.players * 4).bit_length(),
+        (max(topology.vertex_count, topology.edge_count) - 1).bit_length(),
+    )
+
+
+def _pack_bits(fields):
+    """Pack ``(value, width)`` fields MSB-first into base64 characters."""
+    value = 0
+    bits = 0
+    for field, width in fields:
+        value = (value << width) | field
+        bits += width
+    pad = -bits % 6
+    value <<= pad
+    bits += pad
+    return "".join(CODE_ALPHABET[(value >> shift) & 63] for shift in range(bits - 6, -1, -6))
+
+
+class _BitReader:
+    def __init__(self, code):
+        self.code = code
+        self.pos = 0
+
+    def read(self, width, limit=None):
+        value = 0
+        for _ in range(width):
+            digit = _DIGITS[self.code[self.pos // 6]]  # KeyError/IndexError on bad input
+            value = (value << 1) | ((digit >> (5 - self.pos % 6)) & 1)
+            self.pos += 1
+        if limit is not None and value >= limit:
+            raise ValueError(f"Value {value} out of range")
+        return value
+
+
+def save_board(game):
+    """Encode a game position the way the page's Copy Board button does."""
+    board = game.board
+    index_bits, player_bits, count_bits, action_bits = _field_bits(board.board_map)
+    if board.board_map is BASE_MAP:
+        fields = [(SAVE_FORMAT_VERSION, 6)]
+    else:
+        fields = [(MAP_SAVE_FORMAT_VERSION, 6), (board.board_map.id, 4)]
+    fields += [(RESOURCES.index(resource), 3) for resource in board.resources]
+    fields += [(number - 2, 4) for number in board.numbers if number is not None]
+    fields += [(PORT_KINDS.index(port_type), 3) for port_type in board.port_types]
+    fields += [
+        (game.placement_index, index_bits),
+        (PHASES.index(game.phase), 2),
+        (game.current_player - 1, player_bits),
+        (len(game.history), count_bits),
+    ]
+    for action in game.history:
+        fields += [(action.type == "road", 1), (action.index, action_bits), (action.player - 1, player_bits)]
+    return _pack_bits(fields)
+
+
+def save_board_legacy(game):
+    """Encode a game position in the older base64 JSON format."""
+    data = {
+        "hexes": [
+            {"resource": resource, "number": number}
+            for resource, number in zip(game.board.resources, game.board.numbers)
+        ],
+        "portTypes": list(game.board.port_types),
+        "settlements": [
+            {"key": TOPOLOGY.vertex_keys[v], "player": player}
+            for v, player in enumerate(game.settlements) if player
+        ],
+        "roads": [
+            {"key": TOPOLOGY.edge_keys[e], "player": player}
+            for e, player in enumerate(game.roads) if player
+        ],
+        "currentPlayer": game.current_player,
+        "phase": game.phase,
+        "placementIndex": game.placement_index,
+        "robberHex": game.board.robber_hex,
+    }
+    text = json.dumps(data, separators=(",", ":"))
+    return base64.b64encode(text.encode("latin-1")).decode("ascii")
+
+
+def _decode(code):
+    reader = _BitReader(code)
+    version = reader.read(6)
+    if version == SAVE_FORMAT_VERSION:
+        board_map = BASE_MAP
+    elif version == MAP_SAVE_FORMAT_VERSION:
+        board_map = _MAPS_BY_ID[reader.read(4)]  # KeyError for unknown maps
+    else:
+        raise ValueError(f"Unsupported board code version {version}")
+    topology = board_map.topology
+    index_bits, player_bits, count_bits, action_bits = _field_bits(board_map)
+
+    resources = tuple(RESOURCES[reader.read(3, len(RESOURCES))] for _ in board_map.hex_positions)
+    numbers = []
+    for resource in resources:
+        number = None if resource == "desert" else reader.read(4, 11) + 2
+        if number is not None and number not in NUMBER_PROBABILITY:
+            raise ValueError(f"Invalid number {number}")
+        numbers.append(number)
+    port_types = tuple(PORT_KINDS[reader.read(3, len(PORT_KINDS))] for _ in board_map.port_edge_positions)
+
+    placement_index = reader.read(index_bits, len(board_map.placement_order) + 1)
+    phase = PHASES[reader.read(2, len(PHASES))]
+    current_player = reader.read(player_bits, board_map.players) + 1
+    actions = []
+    for _ in range(reader.read(count_bits)):
+        action_type = "road" if reader.read(1) else "settlement"
+        limit = topology.edge_count if action_type == "road" else topology.vertex_count
+        index = reader.read(action_bits, limit)
+        actions.append(Action(action_type, index, reader.read(player_bits, board_map.players) + 1))
+
+    board = Board(resources, tuple(numbers), port_types, board_map)
+    return board, actions, current_player, phase, placement_index
+
+
+def _decode_legacy(encoded, rng):
+    data = json.loads(base64.b64decode(encoded, validate=True).decode("latin-1"))
+    resources = tuple(h["resource"] for h in data["hexes"])
+    numbers = tuple(h["number"] for h in data["hexes"])
+    port_types = data.get("portTypes")
+    if not port_types or len(port_types) != len(PORT_EDGE_POSITIONS):
+        port_types = generate_port_types(rng)
+
+    settlements = [
+        Action("settlement", _VERTEX_INDEX[s["key"]], s["player"])
+        for s in data["settlements"] if s["key"] in _VERTEX_INDEX
+    ]
+    roads = [
+        Action("road", _EDGE_INDEX[r["key"]], r["player"])
+        for r in data["roads"] if r["key"] in _EDGE_INDEX
+    ]
+
+    board = Board(resources, numbers, tuple(port_types))
+    actions = _legacy_play_order(settlements, roads)
+    return board, actions, data["currentPlayer"], data["phase"], data["placementIndex"]
+
+
+def _legacy_play_order(settlements, roads):
+    """Put a legacy save's settlements and roads in an order they could have been played in.
+
+    Old saves don't record move order. The snake draft's players take turns,
+    each placing one of their settlements and then the road touching it.
+    Which of a player's settlements came first isn't known, so one with a
+    road goes before one still waiting for its road. Mirrors
+    ``legacyPlayOrder()`` in the page.
+    """
+    picks = {}
+    for settlement in settlements:
+        road = next((
+            r for r in roads
+            if r.player == settlement.player and settlement.index in TOPOLOGY.edge_vertices[r.index]
+        ), None)
+        picks.setdefault(settlement.player, []).append((settlement, road))
+    for player_picks in picks.values():
+        player_picks.sort(key=lambda pick: pick[1] is None)
+
+    actions = []
+    for player in PLACEMENT_ORDER:
+        if picks.get(player):
+            settlement, road = picks[player].pop(0)
+            actions.append(settlement)
+            if road is not None:
+                actions.append(road)
+    return actions
+
+
+def load_board(encoded, rng=random.random, skip_roads=False):
+    """Decode a saved position (either format) into a Game.
+
+    Legacy saves without ports get ports regenerated with ``rng``, as the
+    page does. Raises ValueError for anything the page would reject.
+    """
+    try:
+        if encoded.startswith("eyJ"):
+            board, actions, current_player, phase, placement_index = _decode_legacy(encoded, rng)
+        else:
+            board, actions, current_player, phase, placement_index = _decode(encoded)
+    except (binascii.Error, UnicodeDecodeError, KeyError, IndexError, TypeError, ValueError) as e:
+        raise ValueError("Invalid board configuration") from e
+
+    game = Game(board, skip_roads=skip_roads)
+    for action in actions:
+        if action.type == "settlement":
+            game.settlements[action.index] = action.player
+            game._update_blocked(action.index, 1)
+        else:
+            game.roads[action.index] = action.player
+        game.history.append(action)
+
+    game.current_player = current_player
+    game.phase = phase
+    game.placement_index = placement_index
+    game.round = 2 if placement_index >= board.board_map.players else 1
+    return game
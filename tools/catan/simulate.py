@@ -0,0 +1,111 @@
+"""Monte Carlo dice simulation of early-game income.
+
+Each roll pays every settlement one resource per adjacent hex showing the
+rolled number; a 7 pays nothing (the robber starts on the desert, so it
+blocks nothing either). Players also start with one resource per hex around
+their second settlement. A trial is ``turns`` rolls, and ``rolls`` dice
+rolls in total are split into ``rolls // turns`` trials, simulated as NumPy
+arrays a chunk of trials at a time. ``simulateIncome()`` in the page runs
+the same simulation in a worker.
+"""
+from dataclasses import dataclass
+
+import numpy as np
+
+from .board import RESOURCES
+
+PRODUCING = RESOURCES[:-1]  # Every resource but the desert
+BUILD_ITEMS = ("road", "settlement", "city")
+# Cost of each BUILD_ITEMS entry, per PRODUCING resource
+BUILD_COSTS = np.array(
+    [
+        [1, 0, 0, 1, 0],  # road: forest, hill
+        [1, 1, 1, 1, 0],  # settlement: forest, field, pasture, hill
+        [0, 2, 0, 0, 3],  # city: 2 field, 3 mountain
+    ],
+    dtype=np.int16,
+)
+DEFAULT_ROLLS = 1_000_000
+DEFAULT_TURNS = 12
+CHUNK_TRIALS = 100_000
+
+
+def income_table(game):
+    """Resources paid per dice total: (13 x P x 5), indexed [total, player - 1, resource].
+
+    P is the number of players on the board's map (4 on the base map).
+    """
+    board = game.board
+    table = np.zeros((13, board.board_map.players, len(PRODUCING)), dtype=np.int16)
+    for v, player in enumerate(game.settlements):
+        if not player:
+            continue
+        for h in game.topology.vertex_hexes[v]:
+            if board.numbers[h] is not None:
+                table[board.numbers[h], player - 1, PRODUCING.index(board.resources[h])] += 1
+    return table
+
+
+def starting_hands(game):
+    """Starting resources from each player's second settlement: (P x 5)."""
+    players = game.board.board_map.players
+    hands = np.zeros((players, len(PRODUCING)), dtype=np.int16)
+    settlements = [action for action in game.history if action.type == "settlement"]
+    for action in settlements[players:]:
+        for h in game.topology.vertex_hexes[action.index]:
+            if game.board.numbers[h] is not None:
+                hands[action.player - 1, PRODUCING.index(game.board.resources[h])] += 1
+    return hands
+
+
+@dataclass
+class IncomeSimulation:
+    """Result of simulate_income()."""
+
+    turns: int
+    trials: int
+    histogram: np.ndarray  # (P x 5 x M): trials ending the run with each resource count
+    build: np.ndarray  # (P x 3 x turns): trials that could afford each item by each turn
+
+    def mean(self):
+        """Mean resources per player after ``turns`` rolls: (P x 5)."""
+        counts = np.arange(self.histogram.shape[2])
+        return (self.histogram * counts).sum(axis=2) / self.trials
+
+    def distribution(self):
+        """Probability of each final resource count: (P x 5 x M)."""
+        return self.histogram / self.trials
+
+    def build_probability(self, turn=None):
+        """Probability each player could afford each BUILD_ITEMS entry by ``turn``: (P x 3)."""
+        return self.build[:, :, (turn or self.turns) - 1] / self.trials
+
+
+def simulate_income(game, rolls=DEFAULT_ROLLS, turns=DEFAULT_TURNS, seed=None):
+    """Simulate ``rolls`` dice rolls as trials of ``turns`` rolls each."""
+    rng = np.random.default_rng(seed)
+    table = income_table(game)
+    start = starting_hands(game)
+    players = len(start)
+    trials = rolls // turns
+    size = int(start.max(initial=0) + turns * table.max(initial=0)) + 1
+
+    histogram = np.zeros(players * len(PRODUCING) * size, dtype=np.int64)
+    build = np.zeros((players, len(BUILD_ITEMS), turns), dtype=np.int64)
+    offsets = np.arange(players * len(PRODUCING)).reshape(players, -1) * size
+
+    for first in range(0, trials, CHUNK_TRIALS):
+        n = min(CHUNK_TRIALS, trials - first)
+        totals = rng.integers(1, 7, (n, turns), dtype=np.int8) + rng.integers(1, 7, (n, turns), dtype=np.int8)
+        hands = np.repeat(start[None], n, axis=0)
+        for t in range(turns):
+            hands += table[totals[:, t]]
+            # Nothing is spent, so a hand that could afford an item still can
+            for item, cost in enumerate(BUILD_COSTS):
+                affordable = np.ones((n, players), dtype=bool)
+                for r in np.flatnonzero(cost):
+                    affordable &= hands[:, :, r] >= cost[r]
+                build[:, item, t] += np.count_nonzero(affordable, axis=0)
+        histogram += np.bincount((hands + offsets).ravel(), minlength=histogram.size)
+
+    return IncomeSimulation(turns, trials, histogram.reshape(players, len(PRODUCING), size), build)
@@ -0,0 +1,267 @@
+"""Aggregate statistics over a stream of boards, and the ``catan-stats`` CLI.
+
+Boards come in BoardBatch chunks from one of three sources:
+
+- ``generate``: the NumPy batch generator (see corpus.py), spread over
+  every core; fast enough for 10^8 boards
+- ``engine``: the page's own generator, board k being ``?seed=SEED+k``;
+  one board at a time, but it reports how many layouts the page deals
+- ``corpus``: a stored corpus file (see boardfile.py), read slice by slice
+  from its memory map
+
+``BoardStats`` folds each chunk into fixed-size histograms and drops it, so
+memory depends on the chunk size, not on the number of boards:
+
+- ``attempts``: per source, how many tries each board took (candidate
+  layouts for ``generate``, dealt layouts for ``engine``)
+- ``max_vertex_pips``: the board's richest vertex
+- ``red_spacing``: hex distance between the two closest 6/8 tokens, and
+  ``red_pair_distances`` the distance between every pair of them
+- ``port_resources``: per port type, the resources of the hexes its two
+  vertices touch
+- ``vertex_pips``: per vertex, how many pips it gets
+
+Histograms are lists indexed by value. ``catan-stats`` prints them as JSON,
+or as CSV rows of ``statistic, group, value, count``.
+"""
+import argparse
+import csv
+import json
+import sys
+
+import numpy as np
+
+from .batch import PIPS, BoardBatch, vertex_pips
+from .board import HEX_POSITIONS, PORT_KINDS, PORT_VERTICES, RESOURCES, TOPOLOGY
+from .boardfile import BoardFile
+from .corpus import DEFAULT_TASK_SIZE, iter_corpus
+from .generate import generate_board_counted
+from .rng import Mulberry32
+
+ENGINE_CHUNK_SIZE = 10_000
+
+# Three hexes of at most 5 pips meet at a vertex
+MAX_VERTEX_PIPS = 3 * int(PIPS.max())
+
+
+def _hex_distance(a, b):
+    dq, dr = a[0] - b[0], a[1] - b[1]
+    return (abs(dq) + abs(dr) + abs(dq + dr)) // 2
+
+
+# Every hex pair once, with the distance between the two hexes
+_PAIR_A, _PAIR_B = np.triu_indices(TOPOLOGY.hex_count, k=1)
+_PAIR_DISTANCE = np.array(
+    [_hex_distance(HEX_POSITIONS[a], HEX_POSITIONS[b]) for a, b in zip(_PAIR_A, _PAIR_B)], dtype=np.intp
+)
+MAX_HEX_DISTANCE = int(_PAIR_DISTANCE.max())
+
+# (port, hex) for every hex touching either vertex of a port, as two index arrays
+_PORT_HEX = [
+    (port, h)
+    for port, (v1, v2) in enumerate(PORT_VERTICES)
+    for h in sorted(set(TOPOLOGY.vertex_hexes[v1]) | set(TOPOLOGY.vertex_hexes[v2]))
+]
+_PORT_INDEX = np.array([port for port, _ in _PORT_HEX], dtype=np.intp)
+_PORT_HEX_INDEX = np.array([h for _, h in _PORT_HEX], dtype=np.intp)
+
+
+def _add_counts(counts, values):
+    """``counts`` plus the histogram of ``values``, grown to fit if needed."""
+    found = np.bincount(np.asarray(values, dtype=np.intp).ravel())
+    if len(found) > len(counts):
+        counts = np.pad(counts, (0, len(found) - len(counts)))
+    counts[:len(found)] += found
+    return counts
+
+
+class BoardStats:
+    """Running histograms over boards added a BoardBatch at a time."""
+
+    def __init__(self):
+        self.boards = 0
+        self.attempts = {}
+        self.max_vertex_pips = np.zeros(MAX_VERTEX_PIPS + 1, dtype=np.int64)
+        self.red_spacing = np.zeros(MAX_HEX_DISTANCE + 1, dtype=np.int64)
+        self.red_pair_distances = np.zeros(MAX_HEX_DISTANCE + 1, dtype=np.int64)
+        self.port_resources = np.zeros((len(PORT_KINDS), len(RESOURCES)), dtype=np.int64)
+        self.vertex_pips = np.zeros((TOPOLOGY.vertex_count, MAX_VERTEX_PIPS + 1), dtype=np.int64)
+
+    def add(self, batch, attempts=None):
+        """Fold ``batch`` into the totals.
+
+        ``attempts`` maps a name to one count per board, for example
+        ``{"candidates": batch.attempts}``.
+        """
+        n = len(batch)
+        self.boards += n
+        for name, values in (attempts or {}).items():
+            self.attempts[name] = _add_counts(self.attempts.get(name, np.zeros(0, dtype=np.int64)), values)
+
+        pips = vertex_pips(batch.numbers).astype(np.intp)
+        self.max_vertex_pips += np.bincount(pips.max(axis=1), minlength=MAX_VERTEX_PIPS + 1)
+        columns = np.arange(TOPOLOGY.vertex_count) * (MAX_VERTEX_PIPS + 1)
+        self.vertex_pips += np.bincount(
+            (pips + columns).ravel(), minlength=self.vertex_pips.size
+        ).reshape(self.vertex_pips.shape)
+
+        red = (batch.numbers == 6) | (batch.numbers == 8)
+        both = red[:, _PAIR_A] & red[:, _PAIR_B]
+        self.red_pair_distances += np.bincount(
+            _PAIR_DISTANCE, weights=both.sum(axis=0), minlength=MAX_HEX_DISTANCE + 1
+        ).astype(np.int64)
+        closest = np.where(both, _PAIR_DISTANCE, MAX_HEX_DISTANCE + 1).min(axis=1)
+        self.red_spacing += np.bincount(closest[closest <= MAX_HEX_DISTANCE], minlength=MAX_HEX_DISTANCE + 1)
+
+        kinds = batch.ports[:, _PORT_INDEX].astype(np.intp)
+        resources = batch.resources[:, _PORT_HEX_INDEX].astype(np.intp)
+        self.port_resources += np.bincount(
+            (kinds * len(RESOURCES) + resources).ravel(), minlength=self.port_resources.size
+        ).reshape(self.port_resources.shape)
+
+    def to_dict(self):
+        """The totals as plain lists and dicts, ready for ``json.dump``."""
+        return {
+            "boards": self.boards,
+            "attempts": {name: counts.tolist() for name, counts in self.attempts.items()},
+            "max_vertex_pips": self.max_vertex_pips.tolist(),
+            "red_spacing": self.red_spacing.tolist(),
+            "red_pair_distances": self.red_pair_distances.tolist(),
+            "port_resources": {
+                kind: dict(zip(RESOURCES, row.tolist())) for kind, row in zip(PORT_KINDS, self.port_resources)
+            },
+            "vertex_pips": self.vertex_pips.tolist(),
+        }
+
+    def rows(self):
+        """Yield ``(statistic, group, value, count)`` for every non-zero count.
+
+        ``group`` is the attempts name, port type or vertex index, and empty
+        for the one-dimensional histograms.
+        """
+        for name, counts in self.attempts.items():
+            yield from (("attempts", name, value, count) for value, count in _nonzero(counts))
+        for statistic in ("max_vertex_pips", "red_spacing", "red_pair_distances"):
+            yield from ((statistic, "", value, count) for value, count in _nonzero(getattr(self, statistic)))
+        for kind, row in zip(PORT_KINDS, self.port_resources):
+            yield from (("port_resources", kind, RESOURCES[r], count) for r, count in _nonzero(row))
+        for v, row in enumerate(self.vertex_pips):
+            yield from (("vertex_pips", v, value, count) for value, count in _nonzero(row))
+
+
+def _nonzero(counts):
+    return ((int(i), int(counts[i])) for i in np.flatnonzero(counts))
+
+
+def generated_chunks(n, seed, workers=None, chunk_size=DEFAULT_TASK_SIZE):
+    """Yield ``(batch, attempts)`` for ``n`` boards from the batch generator.
+
+    The boards are ``corpus.generate_corpus(n, seed)``'s, chunk by chunk.
+    """
+    for batch in iter_corpus(n, seed, workers, chunk_size):
+        yield batch, {"candidates": batch.attempts}
+
+
+def engine_chunks(n, seed, chunk_size=ENGINE_CHUNK_SIZE):
+    """Yield ``(batch, attempts)`` for ``n`` boards from the page's generator.
+
+    Board k is ``generate_board(Mulberry32(seed + k))``, which the page
+    shows for ``?seed=`` plus that seed.
+    """
+    for start in range(0, n, chunk_size):
+        boards, attempts = [], []
+        for k in range(start, min(start + chunk_size, n)):
+            board, board_attempts = generate_board_counted(Mulberry32((seed + k) & 0xFFFFFFFF))
+            boards.append(board)
+            attempts.append(board_attempts)
+        yield BoardBatch.from_boards(boards), {"layouts": attempts}
+
+
+def corpus_chunks(path, chunk_size=DEFAULT_TASK_SIZE):
+    """Yield ``(batch, attempts)`` for every board of a corpus file.
+
+    Corpus files don't record attempts, so ``attempts`` is empty.
+    """
+    corpus = BoardFile(path)
+    for start in range(0, len(corpus), chunk_size):
+        yield corpus.batch(start, start + chunk_size), {}
+
+
+def board_stats(chunks):
+    """Fold ``(batch, attempts)`` chunks into a BoardStats."""
+    stats = BoardStats()
+    for batch, attempts in chunks:
+        stats.add(batch, attempts)
+    return stats
+
+
+def write_json(stats, file, source=None):
+    """Write ``stats.to_dict()`` (with ``source``, if given) to ``file``."""
+    result = stats.to_dict()
+    if source is not None:
+        result = {"source": source, **result}
+    json.dump(result, file)
+    file.write("\n")
+
+
+def write_csv(stats, file):
+    """Write ``stats.rows()`` to ``file`` under a header row."""
+    writer = csv.writer(file, lineterminator="\n")
+    writer.writerow(["statistic", "group", "value", "count"])
+    writer.writerows(stats.rows())
+
+
+def _parser():
+    common = argparse.ArgumentParser(add_help=False)
+    common.add_argument(
+        "--format", choices=("json", "csv"), default="json", help="output format (default: json)"
+    )
+    common.add_argument("-o", "--output", default="-", help="output file (default: stdout)")
+    common.add_argument("--chunk-size", type=int, help="boards held in memory at a time")
+
+    parser = argparse.ArgumentParser(
+        prog="catan-stats", description="Aggregate statistics over generated or stored Catan boards."
+    )
+    sources = parser.add_subparsers(dest="source", required=True)
+
+    generate = sources.add_parser("generate", parents=[common], help="boards from the NumPy batch generator")
+    generate.add_argument("n", type=int, help="number of boards")
+    generate.add_argument("--seed", type=int, default=0, help="corpus seed (default: 0)")
+    generate.add_argument("--workers", type=int, help="worker processes (default: every core)")
+
+    engine = sources.add_parser("engine", parents=[common], help="boards from the page's generator")
+    engine.add_argument("n", type=int, help="number of boards")
+    engine.add_argument("--seed", type=int, default=0, help="page seed of the first board (default: 0)")
+
+    corpus = sources.add_parser("corpus", parents=[common], help="boards from a corpus file")
+    corpus.add_argument("path", help="corpus file written by tools.catan.boardfile")
+    return parser
+
+
+def main(argv=None):
+    """Entry point of the ``catan-stats`` command."""
+    args = _parser().parse_args(argv)
+    if args.source == "generate":
+        chunks = generated_chunks(args.n, args.seed, args.workers, args.chunk_size or DEFAULT_TASK_SIZE)
+        source = {"kind": "generate", "boards": args.n, "seed": args.seed}
+    elif args.source == "engine":
+        chunks = engine_chunks(args.n, args.seed, args.chunk_size or ENGINE_CHUNK_SIZE)
+        source = {"kind": "engine", "boards": args.n, "seed": args.seed}
+    else:
+        chunks = corpus_chunks(args.path, args.chunk_size or DEFAULT_TASK_SIZE)
+        source = {"kind": "corpus", "path": args.path}
+
+    stats = board_stats(chunks)
+    output = sys.stdout if args.output == "-" else open(args.output, "w", newline="")
+    try:
+        if args.format == "json":
+            write_json(stats, output, source)
+        else:
+            write_csv(stats, output)
+    finally:
+        if output is not sys.stdout:
+            output.close()
+
+
+if __name__ == "__main__":
+    main()
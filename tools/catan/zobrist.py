@@ -0,0 +1,76 @@
+"""64-bit Zobrist position keys, the same as ``positionKey()`` in the page.
+
+A key is the board's hash (hex resources and numbers, port types) XOR one
+key per placed settlement and road XOR a key for the turn (placement index
+and phase). The tables are drawn from ``Mulberry32(0x9E3779B9)`` in the
+page's order, each entry two 32-bit outputs (high word first), so keys
+computed here match the page's bit for bit: ``format_key(position_key(game))``
+equals ``positionKey()`` for the same position. Tables are sized by the
+board's map (``?map=`` in the page), so each map has its own keys; the
+module-level tables are the base map's.
+"""
+from functools import lru_cache
+
+from .board import BASE_MAP, PORT_KINDS, RESOURCES
+from .rng import Mulberry32
+
+PHASES = ("settlement", "road", "done")
+SEED = 0x9E3779B9
+
+
+@lru_cache(maxsize=None)
+def _tables(board_map):
+    rng = Mulberry32(SEED)
+    topology = board_map.topology
+    slots = board_map.players + 1
+
+    def keys(count):
+        return tuple((rng.next_uint32() << 32) | rng.next_uint32() for _ in range(count))
+
+    settlement = keys(topology.vertex_count * slots)  # [vertex * slots + player]
+    road = keys(topology.edge_count * slots)  # [edge * slots + player]
+    resource = keys(topology.hex_count * len(RESOURCES))  # [hex * 6 + resource]
+    number = keys(topology.hex_count * 13)  # [hex * 13 + number]
+    port = keys(len(board_map.port_edge_positions) * len(PORT_KINDS))  # [port * 6 + kind]
+    turn = keys((len(board_map.placement_order) + 1) * len(PHASES))  # [placement_index * 3 + phase]
+    return settlement, road, resource, number, port, turn
+
+
+SETTLEMENT_KEYS, ROAD_KEYS, RESOURCE_KEYS, NUMBER_KEYS, PORT_KEYS, TURN_KEYS = _tables(BASE_MAP)
+
+
+def board_key(board):
+    """Hash of ``board`` alone, like the page's ``boardKey()``."""
+    _, _, resource_keys, number_keys, port_keys, _ = _tables(board.board_map)
+    key = 0
+    for h, (resource, number) in enumerate(zip(board.resources, board.numbers)):
+        key ^= resource_keys[h * len(RESOURCES) + RESOURCES.index(resource)]
+        if number is not None:
+            key ^= number_keys[h * 13 + number]
+    for p, kind in enumerate(board.port_types):
+        key ^= port_keys[p * len(PORT_KINDS) + PORT_KINDS.index(kind)]
+    return key
+
+
+def position_key(game, board_hash=None):
+    """Key of ``game``'s board, placements and turn.
+
+    Pass ``board_hash`` (from ``board_key()``) to skip rehashing the board
+    when keying many positions on one board.
+    """
+    board_map = game.board.board_map
+    settlement_keys, road_keys, _, _, _, turn_keys = _tables(board_map)
+    slots = board_map.players + 1
+    key = board_key(game.board) if board_hash is None else board_hash
+    for v, player in enumerate(game.settlements):
+        if player:
+            key ^= settlement_keys[v * slots + player]
+    for e, player in enumerate(game.roads):
+        if player:
+            key ^= road_keys[e * slots + player]
+    return key ^ turn_keys[game.placement_index * len(PHASES) + PHASES.index(game.phase)]
+
+
+def format_key(key):
+    """16 hex digits, as the page formats keys."""
+    return f"{key:016x}"
@@ -0,0 +1,108 @@
+"""A static file server that answers HTTP Range requests.
+
+``python -m http.server`` ignores the ``Range`` header and always sends the
+whole file, so the page falls back to downloading all of ``catan-boards.bin``
+or an opening book. ``RangeRequestHandler`` serves a single byte range
+(``bytes=START-END``, ``bytes=START-`` or ``bytes=-LENGTH``) as a 206 Partial
+Content response, and anything else the way ``SimpleHTTPRequestHandler`` does.
+
+    python -m tools.serve 8000
+"""
+import argparse
+import functools
+import os
+import re
+from http import HTTPStatus
+from http.server import SimpleHTTPRequestHandler, ThreadingHTTPServer
+
+_RANGE = re.compile(r"bytes=(\d*)-(\d*)")
+
+# Bytes copied to the client at a time
+COPY_CHUNK_SIZE = 64 * 1024
+
+
+class RangeRequestHandler(SimpleHTTPRequestHandler):
+    """``SimpleHTTPRequestHandler`` with single-range ``Range`` support.
+
+    Multiple ranges and malformed or backwards ranges are ignored (the whole
+    file is sent, which RFC 9110 allows); a range starting past the end of
+    the file gets 416 Range Not Satisfiable.
+    """
+
+    range_length = None  # Bytes left to send of the current range
+
+    def send_head(self):
+        self.range_length = None
+        match = _RANGE.fullmatch(self.headers.get("Range", "").strip())
+        path = self.translate_path(self.path)
+        first, last = match.groups() if match else ("", "")
+        if not (first or last) or (first and last and int(last) < int(first)) or not os.path.isfile(path):
+            return super().send_head()
+
+        try:
+            f = open(path, "rb")
+        except OSError:
+            self.send_error(HTTPStatus.NOT_FOUND, "File not found")
+            return None
+        try:
+            fs = os.fstat(f.fileno())
+            size = fs.st_size
+            if first:
+                start = int(first)
+                end = min(int(last), size - 1) if last else size - 1
+            else:
+                start = max(size - int(last), 0)
+                end = size - 1 if int(last) else -1
+            if start >= size or start > end:
+                f.close()
+                self.send_response(HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE)
+                self.send_header("Content-Range", f"bytes */{size}")
+                self.send_header("Content-Length", "0")
+                self.end_headers()
+                return None
+
+            self.send_response(HTTPStatus.PARTIAL_CONTENT)
+            self.send_header("Content-type", self.guess_type(path))
+            self.send_header("Content-Range", f"bytes {start}-{end}/{size}")
+            self.send_header("Content-Length", str(end - start + 1))
+            self.send_header("Last-Modified", self.date_time_string(fs.st_mtime))
+            self.send_header("Accept-Ranges", "bytes")
+            self.end_headers()
+            f.seek(start)
+            self.range_length = end - start + 1
+            return f
+        except Exception:
+            f.close()
+            raise
+
+    def copyfile(self, source, outputfile):
+        if self.range_length is None:
+            return super().copyfile(source, outputfile)
+        while self.range_length > 0:
+            chunk = source.read(min(COPY_CHUNK_SIZE, self.range_length))
+            if not chunk:
+                break
+            outputfile.write(chunk)
+            self.range_length -= len(chunk)
+
+
+def main(argv=None):
+    """Serve a directory with ``RangeRequestHandler`` until interrupted."""
+    parser = argparse.ArgumentParser(prog="python -m tools.serve", description=__doc__.splitlines()[0])
+    parser.add_argument("port", type=int, nargs="?", default=8000, help="port (default: 8000)")
+    parser.add_argument("-b", "--bind", default="", help="address to bind (default: all interfaces)")
+    parser.add_argument("-d", "--directory", default=os.getcwd(), help="directory to serve (default: current)")
+    args = parser.parse_args(argv)
+
+    handler = functools.partial(RangeRequestHandler, directory=args.directory)
+    with ThreadingHTTPServer((args.bind, args.port), handler) as server:
+        host, port = server.server_address[:2]
+        print(f"Serving {args.directory} on http://{host or 'localhost'}:{port}/")
+        try:
+            server.serve_forever()
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()